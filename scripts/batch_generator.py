@@ -5,10 +5,15 @@
 """
 
 import argparse
-import json
+import functools
+import itertools
+import orjson
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from production_generator import main as generate_single
+from production_generator import run as run_single
+from utils.json_io import atomic_write_json
 
 def load_character_config(config_file):
     """캐릭터 설정 파일 로드"""
@@ -37,14 +42,62 @@ def load_character_config(config_file):
             ]
         }
         
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(default_config, f, ensure_ascii=False, indent=2)
+        atomic_write_json(config_file, default_config)
         
         print(f"✅ 기본 설정 파일 생성: {config_file}")
         return default_config
     
-    with open(config_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return _load_config_cached(config_file, os.path.getmtime(config_file))
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(config_file, mtime):
+    """설정 파일 파싱 결과 캐시 (mtime이 바뀌면 다시 읽음)"""
+    with open(config_file, 'rb') as f:
+        return orjson.loads(f.read())
+
+def run_job(char_name, age_group, difficulty, count, output_dir, no_firebase, extract_images):
+    """개별 제작 작업 실행 (워커 프로세스에서 호출)"""
+    # 작업 로그는 모아서 작업 종료 시 한 번에 출력
+    log_lines = [f"  🎯 {char_name} {age_group}/{difficulty} - {count}개 생성 중..."]
+    
+    result = {
+        'character': char_name,
+        'age_group': age_group,
+        'difficulty': difficulty,
+        'count': count
+    }
+    
+    try:
+        # 제작 실행 (production_generator 함수 API 직접 호출)
+        dest_file = run_single(
+            character=char_name,
+            count=count,
+            age_group=age_group,
+            difficulty=difficulty,
+            output_dir=output_dir,
+            no_firebase=no_firebase,
+            extract_images=extract_images
+        )
+        
+        if not dest_file:
+            raise RuntimeError('색칠놀이 도안 생성 실패')
+        
+        result['status'] = 'success'
+        log_lines.append(f"  ✅ {char_name} {age_group}/{difficulty} 완료")
+        
+    except Exception as e:
+        log_lines.append(f"  ❌ {char_name} {age_group}/{difficulty} 실패: {e}")
+        result['status'] = 'failed'
+        result['error'] = str(e)
+    
+    sys.stdout.write("\n".join(log_lines) + "\n")
+    sys.stdout.flush()
+    
+    return result
+
+def run_job_star(job):
+    """ProcessPoolExecutor.map용 인자 언패킹 래퍼"""
+    return run_job(*job)
 
 def main():
     parser = argparse.ArgumentParser(description='색칠놀이 도안 배치 제작 도구')
@@ -78,68 +131,24 @@ def main():
     # 출력 디렉토리 생성
     os.makedirs(args.output_dir, exist_ok=True)
     
+    # 작업 목록 구성 (캐릭터 × 연령대 × 난이도)
+    jobs = [
+        (char_config['name'], age_group, difficulty, char_config['count'],
+         args.output_dir, args.no_firebase, args.extract_images)
+        for char_config in config['characters']
+        for age_group, difficulty in itertools.product(char_config['age_groups'], char_config['difficulties'])
+    ]
+    
     total_generated = 0
     results = []
     
-    # 각 캐릭터별로 제작
-    for char_config in config['characters']:
-        char_name = char_config['name']
-        print(f"\n📚 {char_name} 제작 시작...")
-        
-        for age_group in char_config['age_groups']:
-            for difficulty in char_config['difficulties']:
-                count = char_config['count']
-                
-                print(f"  🎯 {age_group}/{difficulty} - {count}개 생성 중...")
-                
-                try:
-                    # 개별 제작 실행
-                    import sys
-                    old_argv = sys.argv.copy()
-                    
-                    # production_generator.py 인자 설정
-                    sys.argv = [
-                        'production_generator.py',
-                        char_name,
-                        '--count', str(count),
-                        '--age-group', age_group,
-                        '--difficulty', difficulty,
-                        '--output-dir', args.output_dir
-                    ]
-                    
-                    if args.no_firebase:
-                        sys.argv.append('--no-firebase')
-                    
-                    if args.extract_images:
-                        sys.argv.append('--extract-images')
-                    
-                    # 제작 실행
-                    generate_single()
-                    
-                    # 원래 argv 복원
-                    sys.argv = old_argv
-                    
-                    total_generated += count
-                    results.append({
-                        'character': char_name,
-                        'age_group': age_group,
-                        'difficulty': difficulty,
-                        'count': count,
-                        'status': 'success'
-                    })
-                    
-                    print(f"  ✅ {char_name} {age_group}/{difficulty} 완료")
-                    
-                except Exception as e:
-                    print(f"  ❌ {char_name} {age_group}/{difficulty} 실패: {e}")
-                    results.append({
-                        'character': char_name,
-                        'age_group': age_group,
-                        'difficulty': difficulty,
-                        'count': count,
-                        'status': 'failed',
-                        'error': str(e)
-                    })
+    # 각 작업은 독립적이므로 프로세스 풀로 병렬 실행
+    if jobs:
+        with ProcessPoolExecutor(max_workers=min(8, len(jobs))) as executor:
+            for result in executor.map(run_job_star, jobs):
+                if result['status'] == 'success':
+                    total_generated += result['count']
+                results.append(result)
     
     # 결과 요약
     print(f"\n🎉 배치 제작 완료!")
@@ -148,22 +157,23 @@ def main():
     print(f"📁 출력 위치: {args.output_dir}")
     
     # 결과 상세
-    print(f"\n📋 제작 결과 상세:")
+    detail_lines = [f"\n📋 제작 결과 상세:"]
     for result in results:
         status_icon = "✅" if result['status'] == 'success' else "❌"
-        print(f"  {status_icon} {result['character']} ({result['age_group']}/{result['difficulty']}) - {result['count']}개")
+        detail_lines.append(f"  {status_icon} {result['character']} ({result['age_group']}/{result['difficulty']}) - {result['count']}개")
         if result['status'] == 'failed':
-            print(f"      오류: {result['error']}")
+            detail_lines.append(f"      오류: {result['error']}")
+    sys.stdout.write("\n".join(detail_lines) + "\n")
     
     # 결과 파일 저장
-    result_file = os.path.join(args.output_dir, f"batch_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-    with open(result_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            'timestamp': datetime.now().isoformat(),
-            'total_generated': total_generated,
-            'output_dir': args.output_dir,
-            'results': results
-        }, f, ensure_ascii=False, indent=2)
+    now = datetime.now()
+    result_file = os.path.join(args.output_dir, f"batch_results_{now.strftime('%Y%m%d_%H%M%S')}.json")
+    atomic_write_json(result_file, {
+        'timestamp': now.isoformat(),
+        'total_generated': total_generated,
+        'output_dir': args.output_dir,
+        'results': results
+    })
     
     print(f"\n📄 결과 파일: {result_file}")
 
@@ -3,20 +3,68 @@
 연관 캐릭터 키워드 수집 및 동적 확장 시스템
 """
 
-import requests
-import json
+import asyncio
+import orjson
+import os
 import re
+from dataclasses import dataclass, asdict
 from typing import List, Dict, Set
-from image_crawler_generator import ImageCrawlerGenerator
+
+# 캐릭터 이름 패턴 (모듈 로드 시 한 번만 컴파일, 단일 스캔)
+# 하츄핑/라라핑, 아이언미야옹, 배트맨/아이언맨, 미키마우스, 도라에몽 등
+_CHAR_RE = re.compile(r'[A-Za-z가-힣]+(?:핑|미야옹|맨|마우스|몬)')
+
+@dataclass(slots=True)
+class CharacterRecord:
+    """캐릭터 데이터베이스 레코드"""
+    name: str
+    description: str
+    discovered_from: str
+    
+    def to_dict(self) -> Dict[str, str]:
+        """JSON 저장용 dict 변환"""
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, str]) -> 'CharacterRecord':
+        """저장된 dict에서 레코드 복원"""
+        return cls(
+            name=data['name'],
+            description=data['description'],
+            discovered_from=data.get('discovered_from', 'generic')
+        )
 
 class CharacterExpansionSystem:
-    def __init__(self):
+    def __init__(self, database_file: str = "character_database.json"):
+        # 무거운 모듈은 실제 사용 시점에 로드 (CLI 시작 시간 단축)
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        from image_crawler_generator import ImageCrawlerGenerator
+        
         self.generator = ImageCrawlerGenerator()
         self.discovered_characters = set()
-        self.character_database = {}
+        
+        # 외부 API 호출용 HTTP 세션 (keep-alive 커넥션 재사용)
+        self.http = requests.Session()
+        self.http.mount('https://', HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        ))
+        self.database_file = database_file
+        
+        # 이전 실행에서 저장된 분석 결과를 캐시로 재사용
+        self.character_database = self.load_character_database(database_file)
         
     def search_related_characters(self, main_character: str) -> List[str]:
         """메인 캐릭터로부터 연관 캐릭터들 검색"""
+        return asyncio.run(self.search_related_characters_async(main_character))
+    
+    async def search_related_characters_async(self, main_character: str) -> List[str]:
+        """메인 캐릭터로부터 연관 캐릭터들 검색 (검색 쿼리 동시 실행)"""
+        import aiohttp
+        
         print(f"🔍 {main_character} 연관 캐릭터 검색 중...")
         
         # 다양한 검색 쿼리 시도
@@ -30,27 +78,36 @@ class CharacterExpansionSystem:
         
         all_characters = set()
         
-        for query in search_queries:
-            try:
-                # Google Search API로 검색
-                search_url = "https://www.googleapis.com/customsearch/v1"
-                params = {
-                    'key': self.generator.google_search_api_key,
-                    'cx': self.generator.google_search_engine_id,
-                    'q': query,
-                    'searchType': 'web',
-                    'num': 10,
-                    'safe': 'medium'
-                }
-                
-                response = requests.get(search_url, params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    characters = self.extract_characters_from_search(data, main_character)
-                    all_characters.update(characters)
-                    
-            except Exception as e:
-                print(f"⚠️ 검색 쿼리 실패: {query} - {e}")
+        # Google Search API로 검색
+        search_url = "https://www.googleapis.com/customsearch/v1"
+        
+        async def fetch(session: aiohttp.ClientSession, query: str) -> dict:
+            params = {
+                'key': self.generator.google_search_api_key,
+                'cx': self.generator.google_search_engine_id,
+                'q': query,
+                'searchType': 'web',
+                'num': 10,
+                'safe': 'medium'
+            }
+            async with session.get(search_url, params=params) as response:
+                if response.status != 200:
+                    return {}
+                return orjson.loads(await response.read())
+        
+        async with aiohttp.ClientSession() as session:
+            responses = await asyncio.gather(
+                *(fetch(session, query) for query in search_queries),
+                return_exceptions=True
+            )
+        
+        for query, data in zip(search_queries, responses):
+            if isinstance(data, Exception):
+                print(f"⚠️ 검색 쿼리 실패: {query} - {data}")
+                continue
+            
+            characters = self.extract_characters_from_search(data, main_character)
+            all_characters.update(characters)
                 
         return list(all_characters)
     
@@ -65,97 +122,99 @@ class CharacterExpansionSystem:
             text = f"{title} {snippet}"
             
             # 캐릭터 이름 패턴 찾기
-            character_patterns = [
-                r'([A-Za-z가-힣]+핑)',  # 하츄핑, 라라핑 등
-                r'([A-Za-z가-힣]+미야옹)',  # 아이언미야옹 등
-                r'([A-Za-z가-힣]+맨)',  # 배트맨, 아이언맨 등
-                r'([A-Za-z가-힣]+마우스)',  # 미키마우스 등
-                r'([A-Za-z가-힣]+몬)',  # 도라에몽 등
-            ]
-            
-            for pattern in character_patterns:
-                matches = re.findall(pattern, text)
-                for match in matches:
-                    if match != main_character and len(match) > 2:
-                        characters.add(match)
+            for match in _CHAR_RE.findall(text):
+                if match != main_character and len(match) > 2:
+                    characters.add(match)
         
         return list(characters)
     
-    def analyze_character_features(self, character_name: str) -> Dict[str, str]:
-        """캐릭터 특징 자동 분석"""
-        print(f"🔍 {character_name} 특징 분석 중...")
+    def analyze_characters_batch(self, character_names: List[str]) -> Dict[str, CharacterRecord]:
+        """여러 캐릭터 특징을 단일 Gemini 요청으로 일괄 분석"""
+        results = {}
+        pending = []
         
-        # 이미지 검색으로 특징 파악
-        try:
-            image_results = self.generator.search_images(character_name, limit=3)
-            if not image_results:
-                return self.generate_default_description(character_name)
+        # 이미 분석된 캐릭터는 요청에서 제외
+        for character_name in character_names:
+            if character_name in self.character_database:
+                results[character_name] = self.character_database[character_name]
+            else:
+                pending.append(character_name)
+        
+        if pending and self.generator.gemini_api_key:
+            print(f"🔍 {len(pending)}개 캐릭터 특징 일괄 분석 중...")
             
-            # Gemini로 특징 분석
+            character_list = "\n".join(f"- {name}" for name in pending)
             analysis_prompt = f"""
-            Analyze this character: {character_name}
+            Analyze each of these characters:
+            {character_list}
             
-            Based on the search results, describe the character's:
+            For each character, describe:
             1. Physical appearance (colors, clothing, accessories)
             2. Unique features (special items, symbols, design elements)
             3. Character type (superhero, magical girl, robot, etc.)
             4. Origin (game, anime, movie, etc.)
             
-            Provide a detailed English description for AI image generation.
+            Return a JSON object keyed by the exact character name given above,
+            where each value is a detailed English description for AI image generation.
             """
             
-            # Gemini API 호출 (텍스트 생성)
-            if self.generator.gemini_api_key:
-                try:
-                    response = requests.post(
-                        f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={self.generator.gemini_api_key}",
-                        headers={'Content-Type': 'application/json'},
-                        json={
-                            'contents': [{'parts': [{'text': analysis_prompt}]}]
-                        }
-                    )
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        if 'candidates' in result and len(result['candidates']) > 0:
-                            description = result['candidates'][0]['content']['parts'][0]['text']
-                            return {
-                                'name': character_name,
-                                'description': description,
-                                'discovered_from': 'auto_analysis'
-                            }
-                except Exception as e:
-                    print(f"⚠️ Gemini 분석 실패: {e}")
-            
-            return self.generate_default_description(character_name)
-            
-        except Exception as e:
-            print(f"⚠️ {character_name} 분석 실패: {e}")
-            return self.generate_default_description(character_name)
+            try:
+                response = self.http.post(
+                    f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={self.generator.gemini_api_key}",
+                    headers={'Content-Type': 'application/json'},
+                    json={
+                        'contents': [{'parts': [{'text': analysis_prompt}]}],
+                        'generationConfig': {'responseMimeType': 'application/json'}
+                    }
+                )
+                
+                if response.status_code == 200:
+                    result = orjson.loads(response.content)
+                    if 'candidates' in result and len(result['candidates']) > 0:
+                        descriptions = orjson.loads(result['candidates'][0]['content']['parts'][0]['text'])
+                        for character_name in pending:
+                            description = descriptions.get(character_name)
+                            if isinstance(description, str) and description:
+                                results[character_name] = CharacterRecord(
+                                    name=character_name,
+                                    description=description,
+                                    discovered_from='auto_analysis'
+                                )
+                else:
+                    print(f"⚠️ Gemini 일괄 분석 오류: {response.status_code}")
+            except Exception as e:
+                print(f"⚠️ Gemini 일괄 분석 실패: {e}")
+        
+        # 응답에서 누락된 캐릭터는 기본 설명 사용
+        for character_name in pending:
+            if character_name not in results:
+                results[character_name] = self.generate_default_description(character_name)
+        
+        return results
     
-    def generate_default_description(self, character_name: str) -> Dict[str, str]:
+    def generate_default_description(self, character_name: str) -> CharacterRecord:
         """기본 캐릭터 설명 생성"""
         # 이름 기반으로 기본 특징 추정
         if '핑' in character_name:
-            return {
-                'name': character_name,
-                'description': f"cute character with unique design, playful expression, magical girl style, {character_name} character",
-                'discovered_from': 'name_pattern'
-            }
+            return CharacterRecord(
+                name=character_name,
+                description=f"cute character with unique design, playful expression, magical girl style, {character_name} character",
+                discovered_from='name_pattern'
+            )
         elif '미야옹' in character_name:
-            return {
-                'name': character_name,
-                'description': f"cute cat character with special features, playful expression, game character style, {character_name} character",
-                'discovered_from': 'name_pattern'
-            }
+            return CharacterRecord(
+                name=character_name,
+                description=f"cute cat character with special features, playful expression, game character style, {character_name} character",
+                discovered_from='name_pattern'
+            )
         else:
-            return {
-                'name': character_name,
-                'description': f"unique character with distinctive features, {character_name} character",
-                'discovered_from': 'generic'
-            }
+            return CharacterRecord(
+                name=character_name,
+                description=f"unique character with distinctive features, {character_name} character",
+                discovered_from='generic'
+            )
     
-    def expand_character_database(self, main_character: str) -> Dict[str, Dict]:
+    def expand_character_database(self, main_character: str) -> Dict[str, CharacterRecord]:
         """캐릭터 데이터베이스 동적 확장"""
         print(f"🚀 {main_character} 기반 캐릭터 데이터베이스 확장 시작")
         print("=" * 60)
@@ -166,22 +225,28 @@ class CharacterExpansionSystem:
         for char in related_characters:
             print(f"  - {char}")
         
-        # 2. 각 캐릭터 분석
-        expanded_database = {}
-        for character in related_characters:
-            if character not in self.character_database:
-                features = self.analyze_character_features(character)
-                expanded_database[character] = features
-                print(f"✅ {character} 분석 완료")
-            else:
+        # 2. 새 캐릭터들 일괄 분석 (공백 정리 후 중복 제거)
+        seen = set(self.character_database)
+        new_characters = []
+        for character in (name.strip() for name in related_characters):
+            if not character:
+                continue
+            if character in seen:
                 print(f"⏭️ {character} 이미 존재")
+                continue
+            seen.add(character)
+            new_characters.append(character)
+        
+        expanded_database = self.analyze_characters_batch(new_characters)
+        for character in expanded_database:
+            print(f"✅ {character} 분석 완료")
         
         # 3. 데이터베이스 업데이트
         self.character_database.update(expanded_database)
         
         return expanded_database
     
-    def generate_coloring_pages_for_discovered(self, discovered_characters: Dict[str, Dict]) -> None:
+    def generate_coloring_pages_for_discovered(self, discovered_characters: Dict[str, CharacterRecord]) -> None:
         """발견된 캐릭터들에 대한 색칠도안 생성"""
         print(f"\n🎨 발견된 캐릭터들 색칠도안 생성")
         print("=" * 50)
@@ -192,7 +257,7 @@ class CharacterExpansionSystem:
                 
                 # 캐릭터 설명을 프롬프트에 추가
                 self.generator.character_descriptions = getattr(self.generator, 'character_descriptions', {})
-                self.generator.character_descriptions[char_name] = char_data['description']
+                self.generator.character_descriptions[char_name] = char_data.description
                 
                 # 색칠도안 생성
                 result_file = self.generator.generate_coloring_pages(
@@ -210,10 +275,31 @@ class CharacterExpansionSystem:
             except Exception as e:
                 print(f"❌ {char_name} 처리 실패: {e}")
     
-    def save_character_database(self, filename: str = "character_database.json"):
+    def load_character_database(self, filename: str) -> Dict[str, CharacterRecord]:
+        """저장된 캐릭터 데이터베이스 로드"""
+        if not os.path.exists(filename):
+            return {}
+        
+        try:
+            with open(filename, 'rb') as f:
+                database = {
+                    name: CharacterRecord.from_dict(data)
+                    for name, data in orjson.loads(f.read()).items()
+                }
+            print(f"📂 캐릭터 데이터베이스 로드: {filename} ({len(database)}개)")
+            return database
+        except Exception as e:
+            print(f"⚠️ 캐릭터 데이터베이스 로드 실패: {e}")
+            return {}
+    
+    def save_character_database(self, filename: str = None):
         """캐릭터 데이터베이스 저장"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.character_database, f, ensure_ascii=False, indent=2)
+        if filename is None:
+            filename = self.database_file
+        
+        with open(filename, 'wb') as f:
+            database = {name: record.to_dict() for name, record in self.character_database.items()}
+            f.write(orjson.dumps(database, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         print(f"💾 캐릭터 데이터베이스 저장: {filename}")
 
 def main():
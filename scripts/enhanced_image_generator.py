@@ -4,14 +4,16 @@ SEO 최적화 및 A4 프린트 최적화된 이미지 생성기
 다국어 지원 (5개 언어) + A4 사이즈 최적화
 """
 
-import os
-import json
+import orjson
 from datetime import datetime
-from image_crawler_generator import ImageCrawlerGenerator
-from seo_metadata_generator import SEOMetadataGenerator
+from utils.json_io import atomic_write_json
 
 class EnhancedImageGenerator:
     def __init__(self):
+        # 무거운 모듈은 실제 사용 시점에 로드 (CLI 시작 시간 단축)
+        from image_crawler_generator import ImageCrawlerGenerator
+        from seo_metadata_generator import SEOMetadataGenerator
+        
         self.image_generator = ImageCrawlerGenerator()
         self.seo_generator = SEOMetadataGenerator()
         
@@ -23,36 +25,33 @@ class EnhancedImageGenerator:
         print(f"캐릭터: {character_name}, 연령대: {age_group}, 난이도: {difficulty}")
         print("=" * 70)
         
-        # 1. 기존 이미지 생성
-        result_file = self.image_generator.generate_coloring_pages(
+        # 1. 기존 이미지 생성 (결과를 파일 대신 메모리로 받음)
+        result_data = self.image_generator.generate_coloring_pages(
             character_name=character_name,
             age_group=age_group,
             difficulty=difficulty,
-            count=count
+            count=count,
+            return_data=True,
+            include_base64=False
         )
         
-        if not result_file:
+        if not result_data:
             print("❌ 이미지 생성 실패")
             return None
         
-        # 2. 생성된 결과 로드
-        with open(result_file, 'r', encoding='utf-8') as f:
-            result_data = json.load(f)
-        
-        # 3. 각 페이지에 대해 SEO 메타데이터 생성
+        # 3. 각 페이지에 대해 SEO 메타데이터 생성 (키워드를 공유하는 배치 API로 한 번에 생성)
+        generated_pages = result_data.get('generated_pages', [])
         enhanced_pages = []
         
-        for i, page in enumerate(result_data.get('generated_pages', []), 1):
-            print(f"\\n📝 페이지 {i} SEO 메타데이터 생성 중...")
-            
-            # SEO 메타데이터 생성
-            seo_metadata = self.seo_generator.generate_seo_metadata(
-                character_name=character_name,
-                age_group=age_group,
-                difficulty=difficulty,
-                image_url=page.get('firebase_url', ''),
-                page_number=i
-            )
+        seo_list = self.seo_generator.generate_seo_metadata_batch([
+            (character_name, age_group, difficulty, page.get('firebase_url', ''), i)
+            for i, page in enumerate(generated_pages, 1)
+        ])
+        
+        lang_codes = tuple(self.seo_generator.languages.keys())
+        
+        for i, (page, seo_metadata) in enumerate(zip(generated_pages, seo_list), 1):
+            print(f"\\n📝 페이지 {i} SEO 메타데이터 생성 완료")
             
             # 페이지 데이터에 SEO 메타데이터 추가
             enhanced_page = {
@@ -65,40 +64,42 @@ class EnhancedImageGenerator:
                     'dpi': 300,
                     'unit': 'pixels'
                 },
-                'multilingual_support': list(self.seo_generator.languages.keys())
+                'multilingual_support': list(lang_codes)
             }
             
             enhanced_pages.append(enhanced_page)
             
             # 다국어 제목 출력
-            print(f"  🇰🇷 한국어: {seo_metadata['multilingual_metadata']['ko']['seo_metadata']['title']}")
-            print(f"  🇺🇸 English: {seo_metadata['multilingual_metadata']['en']['seo_metadata']['title']}")
-            print(f"  🇪🇸 Español: {seo_metadata['multilingual_metadata']['es']['seo_metadata']['title']}")
-            print(f"  🇯🇵 日本語: {seo_metadata['multilingual_metadata']['ja']['seo_metadata']['title']}")
-            print(f"  🇨🇳 中文: {seo_metadata['multilingual_metadata']['zh']['seo_metadata']['title']}")
-        
-        # 4. 향상된 결과 데이터 구성
+            multilingual_metadata = seo_metadata['multilingual_metadata']
+            ko, en, es, ja, zh = (multilingual_metadata[lang_code]['seo_metadata'] for lang_code in ('ko', 'en', 'es', 'ja', 'zh'))
+            print(f"  🇰🇷 한국어: {ko['title']}")
+            print(f"  🇺🇸 English: {en['title']}")
+            print(f"  🇪🇸 Español: {es['title']}")
+            print(f"  🇯🇵 日本語: {ja['title']}")
+            print(f"  🇨🇳 中文: {zh['title']}")
+        
+        # 4. 향상된 결과 데이터 구성 (시각은 한 번만 조회)
+        now = datetime.now()
         enhanced_result = {
             'character_name': character_name,
             'age_group': age_group,
             'difficulty': difficulty,
-            'generated_at': datetime.now().isoformat(),
+            'generated_at': now.isoformat(),
             'total_pages': len(enhanced_pages),
             'seo_optimized': True,
             'print_optimized': True,
             'a4_compatible': True,
-            'multilingual_support': list(self.seo_generator.languages.keys()),
+            'multilingual_support': list(lang_codes),
             'generated_pages': enhanced_pages,
             'reference_images': result_data.get('reference_images', []),
             'seo_summary': self._generate_seo_summary(enhanced_pages)
         }
         
         # 5. 향상된 결과 저장
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
         enhanced_filename = f"enhanced_coloring_pages_{character_name}_{timestamp}.json"
         
-        with open(enhanced_filename, 'w', encoding='utf-8') as f:
-            json.dump(enhanced_result, f, ensure_ascii=False, indent=2)
+        atomic_write_json(enhanced_filename, enhanced_result)
         
         print(f"\\n✅ 향상된 색칠도안 생성 완료!")
         print(f"📁 파일: {enhanced_filename}")
@@ -112,21 +113,20 @@ class EnhancedImageGenerator:
     def _generate_seo_summary(self, enhanced_pages: list) -> dict:
         """SEO 요약 정보 생성"""
         
-        # 모든 키워드 수집
+        # 전체 키워드와 언어별 키워드를 한 번의 순회로 수집
+        lang_codes = tuple(self.seo_generator.languages.keys())
         all_keywords = set()
+        lang_keywords = {lang_code: set() for lang_code in lang_codes}
+        lang_items = tuple(lang_keywords.items())
         for page in enhanced_pages:
-            for lang_code in self.seo_generator.languages.keys():
-                keywords = page['seo_metadata']['multilingual_metadata'][lang_code]['seo_metadata']['keywords']
+            multilingual_metadata = page['seo_metadata']['multilingual_metadata']
+            for lang_code, keyword_set in lang_items:
+                keywords = multilingual_metadata[lang_code]['seo_metadata']['keywords']
+                keyword_set.update(keywords)
                 all_keywords.update(keywords)
         
         # 언어별 키워드 통계
-        keyword_stats = {}
-        for lang_code in self.seo_generator.languages.keys():
-            lang_keywords = set()
-            for page in enhanced_pages:
-                keywords = page['seo_metadata']['multilingual_metadata'][lang_code]['seo_metadata']['keywords']
-                lang_keywords.update(keywords)
-            keyword_stats[lang_code] = list(lang_keywords)
+        keyword_stats = {lang_code: list(keyword_set) for lang_code, keyword_set in lang_keywords.items()}
         
         return {
             'total_keywords': len(all_keywords),
@@ -153,33 +153,32 @@ class EnhancedImageGenerator:
     def generate_sitemap_data(self, enhanced_pages: list) -> dict:
         """사이트맵 데이터 생성"""
         
-        sitemap_entries = []
-        
-        for page in enhanced_pages:
-            character_name = page['seo_metadata']['base_info']['character_name']
-            page_number = page['seo_metadata']['base_info']['page_number']
-            
-            # 각 언어별 URL 생성
-            for lang_code in self.seo_generator.languages.keys():
-                file_naming = page['seo_metadata']['multilingual_metadata'][lang_code]['file_naming']
-                
-                sitemap_entry = {
-                    'url': f"/coloring-pages/{file_naming['url_slug']}",
-                    'lastmod': datetime.now().strftime('%Y-%m-%d'),
-                    'changefreq': 'weekly',
-                    'priority': 0.8,
-                    'language': lang_code,
-                    'title': page['seo_metadata']['multilingual_metadata'][lang_code]['seo_metadata']['title'],
-                    'description': page['seo_metadata']['multilingual_metadata'][lang_code]['seo_metadata']['description']
-                }
-                
-                sitemap_entries.append(sitemap_entry)
+        lang_codes = tuple(self.seo_generator.languages.keys())
+        now = datetime.now()
+        today = now.strftime('%Y-%m-%d')
+        
+        # 페이지 × 언어별 URL 생성
+        sitemap_entries = [
+            {
+                'url': f"/coloring-pages/{metadata['file_naming']['url_slug']}",
+                'lastmod': today,
+                'changefreq': 'weekly',
+                'priority': 0.8,
+                'language': lang_code,
+                'title': metadata['seo_metadata']['title'],
+                'description': metadata['seo_metadata']['description']
+            }
+            for page in enhanced_pages
+            for multilingual_metadata in (page['seo_metadata']['multilingual_metadata'],)
+            for lang_code in lang_codes
+            for metadata in (multilingual_metadata[lang_code],)
+        ]
         
         return {
             'sitemap_entries': sitemap_entries,
             'total_urls': len(sitemap_entries),
-            'languages': list(self.seo_generator.languages.keys()),
-            'generated_at': datetime.now().isoformat()
+            'languages': list(lang_codes),
+            'generated_at': now.isoformat()
         }
 
 def main():
@@ -208,14 +207,13 @@ def main():
             print(f"✅ {character} 생성 완료: {result_file}")
             
             # 사이트맵 데이터 생성
-            with open(result_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(result_file, 'rb') as f:
+                data = orjson.loads(f.read())
             
             sitemap_data = generator.generate_sitemap_data(data['generated_pages'])
             sitemap_file = f"sitemap_{character}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             
-            with open(sitemap_file, 'w', encoding='utf-8') as f:
-                json.dump(sitemap_data, f, ensure_ascii=False, indent=2)
+            atomic_write_json(sitemap_file, sitemap_data)
             
             print(f"🗺️ 사이트맵 생성: {sitemap_file}")
         else:
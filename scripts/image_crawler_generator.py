@@ -7,39 +7,225 @@
 """
 
 import os
-import json
 import base64
+import binascii
+import functools
+import hashlib
+import io
+import mimetypes
+import mmap
+import shutil
+import tarfile
+import orjson
+import httpx
 import requests
-import cv2
-import numpy as np
-from PIL import Image, ImageDraw, ImageFont
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import firebase_admin
 from firebase_admin import credentials, storage
-from google.cloud import storage as gcs
+from google.cloud.storage.retry import DEFAULT_RETRY
 from dotenv import load_dotenv
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-# 환경변수 로드
+# 환경변수 로드 (모듈 로드 시 한 번만, 상위 디렉토리의 .env 파일 포함)
 load_dotenv()
+load_dotenv('../.env', override=False)
+
+GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+GOOGLE_SEARCH_API_KEY = os.getenv('GOOGLE_SEARCH_API_KEY')
+GOOGLE_SEARCH_ENGINE_ID = os.getenv('GOOGLE_SEARCH_ENGINE_ID')
+
+# 디버그 모드에서만 결과 JSON을 들여쓰기해 저장
+DEBUG = os.getenv('DEBUG', '').lower() in ('1', 'true', 'yes')
+
+# 제미나이 이미지 생성 동시 요청 수 / 초당 요청 수 / 페이지별 타임아웃(초)
+FETCH_BATCH_SIZE = 4
+GEMINI_REQUESTS_PER_SECOND = 2
+GEMINI_PAGE_TIMEOUT = 60
+
+# 생성된 색칠도안 동시 업로드 수 (기본값)
+UPLOAD_WORKERS = 4
+
+# Google 커스텀 검색 요청당 최대 결과 수 (API 제한)
+SEARCH_PAGE_SIZE = 10
+
+# 이미지 다운로드 청크 크기 / 최대 허용 크기
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+MAX_DOWNLOAD_BYTES = 20 * 1024 * 1024
+
+# Base64 인코딩 청크 크기 (3의 배수라 청크 사이에 패딩이 생기지 않음)
+BASE64_CHUNK_SIZE = 57 * 1024
+
+# Firebase Storage 묶음 스트리밍 업로드 청크 크기 (256KiB의 배수)
+UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+# 프롬프트 최적화 결과 캐시 파일 (원본 프롬프트 sha256 -> 최적화된 프롬프트)
+PROMPT_CACHE_FILE = 'prompt_cache.json'
+
+# 캐릭터별 특화 설명 (영어만 사용)
+CHARACTER_DESCRIPTIONS = {
+    '하츄핑': "pink-haired character with heart decorations, crown tiara, pink dress with white top, cute chibi proportions, magical girl style, TiniPing character",
+    '라라핑': "blue-haired character with star decorations, crown tiara, blue dress, cute chibi proportions, magical girl style, TiniPing character", 
+    '바로핑': "yellow-haired character with sun decorations, crown tiara, yellow dress, cute chibi proportions, magical girl style, TiniPing character",
+    '차차핑': "green-haired character with leaf decorations, crown tiara, green dress, cute chibi proportions, magical girl style, TiniPing character",
+    '도라에몽': "blue robot cat with white belly, red collar with bell, round head, no ears, cute proportions, Doraemon character",
+    '미키마우스': "black mouse with large round ears, red shorts, yellow shoes, white gloves, Disney character",
+    '피카츄': "yellow electric mouse with red cheeks, brown stripes on back, black-tipped ears, Pokemon character",
+    '배트맨': "dark superhero with black cape, bat symbol on chest, pointy bat ears, muscular build, intimidating presence, DC Comics character",
+    '운빨존만겜': "lucky character with gambling theme, dice symbols, coin decorations, playful expression, game character style",
+    '아이언미야옹': "lucky gambling game character, cute cat with iron armor, mechanical elements, futuristic design, playful expression, distinctive helmet design, chest reactor, gaming mascot style"
+}
+
+# 연령대/난이도별 프롬프트 템플릿 ({char_desc}에 캐릭터 설명을 채워 사용)
+AGE_PROMPT_TEMPLATES = {
+    ('child', 'easy'): "{char_desc}, simple coloring page for children ages 3-6, thick bold outlines 5-6px, minimal details, large clear coloring areas, cute chibi proportions, friendly expression",
+    ('child', 'medium'): "{char_desc}, coloring page for children ages 6-8, medium line weight 3-4px, moderate details, balanced complexity, dynamic pose, cheerful expression",
+    ('child', 'hard'): "{char_desc}, detailed coloring page for children ages 8-10, fine line art 2-3px, intricate patterns, complex elements, expressive pose",
+    ('teen', 'easy'): "{char_desc}, teen-friendly coloring page ages 9-12, medium line weight 3-4px, clear outlines, moderate details, cool pose",
+    ('teen', 'medium'): "{char_desc}, detailed coloring page for teens ages 12-15, fine line art 2-3px, intricate details, dynamic composition, stylish pose",
+    ('teen', 'hard'): "{char_desc}, complex coloring page for teens ages 15+, very fine line art 1-2px, highly detailed design, sophisticated composition, dramatic pose",
+    ('adult', 'easy'): "{char_desc}, adult coloring page ages 16+, medium complexity, clean line art 2-3px, elegant design, sophisticated pose",
+    ('adult', 'medium'): "{char_desc}, detailed adult coloring page, fine line art 1-2px, intricate patterns, complex composition, artistic pose",
+    ('adult', 'hard'): "{char_desc}, highly detailed adult coloring page, very fine line art 1px, extremely intricate patterns, complex mandala-style elements, artistic masterpiece"
+}
+
+# 이미지 생성 포즈/표정 변형 (다양성을 위한 변형)
+POSE_VARIATIONS = (
+    "cute and friendly expression",
+    "happy and cheerful pose", 
+    "playful and energetic stance",
+    "calm and peaceful pose",
+    "excited and joyful expression",
+    "thoughtful and curious look",
+    "adventurous and brave pose",
+    "gentle and kind expression",
+    "funny and silly pose",
+    "confident and proud stance"
+)
+
+_prompt_cache = None
+_prompt_cache_lock = threading.Lock()
+
+def _load_prompt_cache() -> dict:
+    """프롬프트 캐시를 처음 필요할 때 한 번만 로드"""
+    global _prompt_cache
+    if _prompt_cache is None:
+        try:
+            with open(PROMPT_CACHE_FILE, 'rb') as f:
+                _prompt_cache = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            _prompt_cache = {}
+    return _prompt_cache
+
+def _save_prompt_cache(key: str, optimized_prompt: str):
+    """캐시에 결과 추가 후 임시 파일 + os.replace로 원자적 저장"""
+    with _prompt_cache_lock:
+        cache = _load_prompt_cache()
+        cache[key] = optimized_prompt
+        tmp_path = f"{PROMPT_CACHE_FILE}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(cache, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, PROMPT_CACHE_FILE)
+
+class RateLimiter:
+    """토큰 버킷 요청 속도 제한기 (초당 permits개, 요청 시작 시 토큰을 소모하고 끝날 때까지 붙잡지 않음)"""
+    
+    def __init__(self, permits_per_second: int, period: float = 1.0):
+        self._capacity = permits_per_second
+        self._tokens = float(permits_per_second)
+        self._fill_rate = permits_per_second / period
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """토큰 하나 소모 (없으면 다음 토큰이 채워질 때까지 대기)"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._fill_rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self._fill_rate
+            time.sleep(delay)
 
 class ImageCrawlerGenerator:
     def __init__(self):
         """이미지 크롤러 생성기 초기화"""
-        # 환경변수 로드 (상위 디렉토리의 .env 파일)
-        load_dotenv('../.env')
+        self.gemini_api_key = GEMINI_API_KEY
+        self.google_search_api_key = GOOGLE_SEARCH_API_KEY
+        self.google_search_engine_id = GOOGLE_SEARCH_ENGINE_ID
         
-        self.gemini_api_key = os.getenv('GEMINI_API_KEY')
-        self.google_search_api_key = os.getenv('GOOGLE_SEARCH_API_KEY')
-        self.google_search_engine_id = os.getenv('GOOGLE_SEARCH_ENGINE_ID')
+        # 외부 API 호출용 HTTP 세션 (keep-alive 커넥션 재사용)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=50,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': 'ColoringPageGenerator/1.0',
+            'Accept-Encoding': 'gzip, deflate'
+        })
         
-        # Firebase 초기화
-        self.init_firebase()
+        # 제미나이 API 호출용 HTTP/2 클라이언트 (동시 요청을 한 커넥션에 다중화)
+        self.gemini_client = httpx.Client(
+            timeout=60,
+            transport=httpx.HTTPTransport(http2=True, retries=3),
+            headers={
+                'User-Agent': 'ColoringPageGenerator/1.0',
+                'Accept-Encoding': 'gzip'
+            }
+        )
+        
+        # 제미나이 이미지 생성 요청 속도 제한
+        self.gemini_rate_limiter = RateLimiter(GEMINI_REQUESTS_PER_SECOND)
+        
+        # 버킷에 allUsers:objectViewer 권한이 있으면 객체별 make_public() 생략
+        self.bucket_public = os.getenv('FIREBASE_BUCKET_PUBLIC', '').lower() in ('1', 'true', 'yes')
+        self._pending_public_blobs = []
+        self._pending_public_lock = threading.Lock()
+        
+        # Firebase는 bucket에 처음 접근할 때 초기화
+        self._bucket = None
+        self._firebase_initialized = False
+        self._firebase_lock = threading.Lock()
         
         # 다운로드 디렉토리 생성
         self.download_dir = "downloaded_images"
         os.makedirs(self.download_dir, exist_ok=True)
         
+    def close(self):
+        """HTTP 세션 종료"""
+        self.session.close()
+        self.gemini_client.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    @property
+    def bucket(self):
+        """Firebase Storage 버킷 (첫 접근 시 초기화)"""
+        if not self._firebase_initialized:
+            with self._firebase_lock:
+                if not self._firebase_initialized:
+                    self.init_firebase()
+        return self._bucket
+    
+    @bucket.setter
+    def bucket(self, value):
+        self._bucket = value
+        self._firebase_initialized = True
+    
     def init_firebase(self):
         """Firebase 초기화"""
         try:
@@ -77,24 +263,36 @@ class ImageCrawlerGenerator:
                 'cx': self.google_search_engine_id,
                 'q': f"{search_query} official art",
                 'searchType': 'image',
-                'num': limit,
                 'safe': 'medium',
                 'imgSize': 'large',
-                'imgType': 'photo'
+                'imgType': 'photo',
+                # 사용하는 필드만 받아 응답 크기 축소
+                'fields': 'items(link,title,image/thumbnailLink)'
             }
             
-            response = requests.get(search_url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            image_urls = []
+            def fetch_page(start):
+                page_params = dict(params, start=start, num=min(SEARCH_PAGE_SIZE, limit - start + 1))
+                response = self.session.get(search_url, params=page_params)
+                response.raise_for_status()
+                return orjson.loads(response.content).get('items', [])
+            
+            # 요청당 최대 10개이므로 limit이 크면 start를 10씩 늘려 동시에 요청
+            starts = range(1, limit + 1, SEARCH_PAGE_SIZE)
+            if len(starts) > 1:
+                with ThreadPoolExecutor(max_workers=len(starts)) as executor:
+                    pages = list(executor.map(fetch_page, starts))
+            else:
+                pages = [fetch_page(start) for start in starts]
             
-            for item in data.get('items', []):
-                image_urls.append({
+            image_urls = [
+                {
                     'url': item['link'],
                     'title': item['title'],
                     'thumbnail': item['image']['thumbnailLink']
-                })
+                }
+                for items in pages
+                for item in items
+            ]
             
             print(f"✅ {character_name} 이미지 {len(image_urls)}개 검색 완료")
             return image_urls
@@ -105,61 +303,26 @@ class ImageCrawlerGenerator:
     
     def mock_image_search(self, character_name: str, limit: int) -> list:
         """모의 이미지 검색 (API 키가 없을 때)"""
-        mock_images = []
-        
-        # 테스트용 로컬 이미지 파일들
+        # 테스트용 로컬 이미지 파일들 (캐릭터당 한 장, 같은 파일을 중복 복사/업로드하지 않음)
         test_images = {
-            '피카츄': [
-                'test_images/포켓몬 피카츄_test.png',
-                'test_images/포켓몬 피카츄_test.png',
-                'test_images/포켓몬 피카츄_test.png'
-            ],
-            '미키마우스': [
-                'test_images/미키마우스_test.png',
-                'test_images/미키마우스_test.png',
-                'test_images/미키마우스_test.png'
-            ],
-            '헬로키티': [
-                'test_images/헬로키티_test.png',
-                'test_images/헬로키티_test.png',
-                'test_images/헬로키티_test.png'
-            ],
-            '도라에몽': [
-                'test_images/도라에몽_test.png',
-                'test_images/도라에몽_test.png',
-                'test_images/도라에몽_test.png'
-            ],
-            '하츄핑': [
-                'test_images/하츄핑_test.png',
-                'test_images/하츄핑_test.png',
-                'test_images/하츄핑_test.png'
-            ],
-            '아이언미야옹': [
-                'test_images/아이언미야옹_test.png',
-                'test_images/아이언미야옹_test.png',
-                'test_images/아이언미야옹_test.png'
-            ]
+            '피카츄': 'test_images/포켓몬 피카츄_test.png',
+            '미키마우스': 'test_images/미키마우스_test.png',
+            '헬로키티': 'test_images/헬로키티_test.png',
+            '도라에몽': 'test_images/도라에몽_test.png',
+            '하츄핑': 'test_images/하츄핑_test.png',
+            '아이언미야옹': 'test_images/아이언미야옹_test.png'
         }
         
-        # 캐릭터 이름에 따른 이미지 선택
-        for key, urls in test_images.items():
-            if key in character_name:
-                for i, url in enumerate(urls[:limit]):
-                    mock_images.append({
-                        'url': url,
-                        'title': f"{character_name} Official Art {i+1}",
-                        'thumbnail': url
-                    })
-                break
-        
-        if not mock_images:
-            # 기본 이미지 (로컬 테스트 이미지 사용)
-            for i in range(limit):
-                mock_images.append({
-                    'url': f'test_images/도라에몽_test.png',
-                    'title': f"{character_name} Official Art {i+1}",
-                    'thumbnail': f'test_images/도라에몽_test.png'
-                })
+        # 캐릭터 이름에 따른 이미지 선택 (없으면 기본 로컬 테스트 이미지 사용)
+        url = next(
+            (path for key, path in test_images.items() if key in character_name),
+            'test_images/도라에몽_test.png'
+        )
+        mock_images = [{
+            'url': url,
+            'title': f"{character_name} Official Art 1",
+            'thumbnail': url
+        }] if limit > 0 else []
         
         print(f"✅ {character_name} 모의 이미지 {len(mock_images)}개 생성")
         return mock_images
@@ -167,13 +330,13 @@ class ImageCrawlerGenerator:
     def download_image(self, image_url: str, filename: str, thumbnail_url: str = None) -> str:
         """이미지 다운로드 (썸네일 우선, 로컬 파일 지원)"""
         try:
-            # 로컬 파일인 경우
-            if image_url.startswith('test_images/') or not image_url.startswith('http'):
-                if os.path.exists(image_url):
+            # 로컬 파일인 경우 (http(s)가 아닌 모든 경로)
+            if not image_url.startswith(('http://', 'https://')):
+                image_path = image_url.removeprefix('file://')
+                if os.path.exists(image_path):
                     # 파일 복사
-                    import shutil
                     filepath = os.path.join(self.download_dir, filename)
-                    shutil.copy2(image_url, filepath)
+                    self._copy_local_file(image_path, filepath)
                     print(f"✅ 로컬 이미지 복사 완료: {filename}")
                     return filepath
                 else:
@@ -183,23 +346,21 @@ class ImageCrawlerGenerator:
             # 썸네일 이미지 우선 시도
             if thumbnail_url:
                 try:
-                    response = requests.get(thumbnail_url, timeout=10)
-                    if response.status_code == 200:
-                        filepath = os.path.join(self.download_dir, filename)
-                        with open(filepath, 'wb') as f:
-                            f.write(response.content)
-                        print(f"✅ 썸네일 이미지 다운로드 완료: {filename}")
-                        return filepath
+                    with self.session.get(thumbnail_url, timeout=10, stream=True) as response:
+                        if response.status_code == 200:
+                            filepath = os.path.join(self.download_dir, filename)
+                            self._stream_to_file(response, filepath)
+                            print(f"✅ 썸네일 이미지 다운로드 완료: {filename}")
+                            return filepath
                 except Exception as e:
                     print(f"⚠️ 썸네일 다운로드 실패, 원본 시도: {e}")
             
             # 원본 이미지 시도
-            response = requests.get(image_url, timeout=10)
-            response.raise_for_status()
-            
-            filepath = os.path.join(self.download_dir, filename)
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
+            with self.session.get(image_url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                
+                filepath = os.path.join(self.download_dir, filename)
+                self._stream_to_file(response, filepath)
             
             print(f"✅ 이미지 다운로드 완료: {filename}")
             return filepath
@@ -208,8 +369,52 @@ class ImageCrawlerGenerator:
             print(f"❌ 이미지 다운로드 실패: {e}")
             return None
     
-    def upload_to_firebase_storage(self, image_path: str, character_name: str) -> str:
-        """Firebase Storage에 이미지 업로드 (로컬 모드)"""
+    def _copy_local_file(self, src_path: str, dst_path: str):
+        """로컬 파일 복사 (shutil.copyfile은 Linux에서만 sendfile 커널 내 복사, 그 외 플랫폼은 버퍼 복사로 대체, 메타데이터 복사 생략)"""
+        shutil.copyfile(src_path, dst_path)
+    
+    def _queue_make_public(self, blob, pending_blobs: list = None):
+        """공개 ACL 설정 대기열에 추가 (버킷 전체가 공개면 생략, pending_blobs가 없으면 인스턴스 대기열 사용)"""
+        if self.bucket_public:
+            return
+        if pending_blobs is not None:
+            pending_blobs.append(blob)
+            return
+        with self._pending_public_lock:
+            self._pending_public_blobs.append(blob)
+    
+    def publish_pending_blobs(self, blobs: list = None):
+        """대기 중인 blob들의 공개 ACL을 병렬로 설정 (blobs를 주면 해당 목록만, 아니면 인스턴스 대기열 전체)"""
+        if blobs is None:
+            with self._pending_public_lock:
+                blobs, self._pending_public_blobs = self._pending_public_blobs, []
+        
+        if not blobs:
+            return
+        
+        def make_public(blob):
+            try:
+                blob.make_public()
+            except Exception as e:
+                print(f"⚠️ 공개 ACL 설정 실패: {blob.name} - {e}")
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(make_public, blobs))
+        
+        print(f"✅ 공개 ACL 설정 완료: {len(blobs)}개")
+    
+    def _stream_to_file(self, response, filepath: str):
+        """응답 본문을 고정 크기 청크로 디스크에 기록 (전체 바이트를 메모리에 올리지 않음)"""
+        content_length = response.headers.get('content-length')
+        if content_length and int(content_length) > MAX_DOWNLOAD_BYTES:
+            raise ValueError(f"이미지가 너무 큽니다: {content_length} bytes")
+        
+        with open(filepath, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+    
+    def upload_to_firebase_storage(self, image_path: str, character_name: str, pending_blobs: list = None) -> str:
+        """Firebase Storage에 이미지 업로드 (로컬 모드, 공개 ACL 대기 blob은 pending_blobs에 추가)"""
         try:
             if not self.bucket:
                 print("⚠️ Firebase Storage가 초기화되지 않아 로컬 모드로 작동합니다.")
@@ -219,12 +424,20 @@ class ImageCrawlerGenerator:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             blob_name = f"reference_images/{character_name}/{timestamp}_{os.path.basename(image_path)}"
             
-            # 파일 업로드
+            # 파일 업로드 (8MiB 이하는 단일 multipart 요청, 실패 시 재시도 + crc32c 검증)
             blob = self.bucket.blob(blob_name)
-            blob.upload_from_filename(image_path)
-            
-            # 공개 URL 생성
-            blob.make_public()
+            content_type = mimetypes.guess_type(image_path)[0] or 'application/octet-stream'
+            with open(image_path, 'rb') as f:
+                blob.upload_from_file(
+                    f,
+                    content_type=content_type,
+                    size=os.fstat(f.fileno()).st_size,
+                    retry=DEFAULT_RETRY,
+                    checksum='crc32c'
+                )
+            
+            # 공개 URL 생성 (ACL 설정은 업로드 완료 후 일괄 처리)
+            self._queue_make_public(blob, pending_blobs)
             public_url = blob.public_url
             
             print(f"✅ Firebase Storage 업로드 완료: {public_url}")
@@ -234,27 +447,29 @@ class ImageCrawlerGenerator:
             print(f"❌ Firebase Storage 업로드 실패: {e}")
             return f"file://{image_path}"
     
-    def upload_coloring_page_to_firebase(self, base64_image: str, character_name: str, age_group: str, difficulty: str, page_number: int) -> str:
-        """색칠도안을 Firebase Storage에 업로드"""
+    def upload_coloring_page_to_firebase(self, image_bytes: bytes, character_name: str, age_group: str, difficulty: str, page_number: int, batch_timestamp: str = None, pending_blobs: list = None) -> str:
+        """색칠도안을 Firebase Storage에 업로드 (batch_timestamp가 없으면 현재 시각 사용, 공개 ACL 대기 blob은 pending_blobs에 추가)"""
         try:
             if not self.bucket:
                 print("⚠️ Firebase Storage가 초기화되지 않아 로컬 모드로 작동합니다.")
                 return f"local_coloring_page_{page_number}.png"
             
-            # Base64를 이미지 파일로 변환
-            import base64
-            image_data = base64.b64decode(base64_image)
-            
             # 파일명 생성
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = batch_timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"{character_name}_page_{page_number:02d}_{timestamp}.png"
             
-            # Firebase Storage에 업로드
+            # Firebase Storage에 업로드 (단일 multipart 요청, 실패 시 재시도 + crc32c 검증)
             blob = self.bucket.blob(f"coloring_pages/{age_group}/{difficulty}/{character_name}/{filename}")
-            blob.upload_from_string(image_data, content_type='image/png')
+            blob.upload_from_file(
+                io.BytesIO(image_bytes),
+                content_type='image/png',
+                size=len(image_bytes),
+                retry=DEFAULT_RETRY,
+                checksum='crc32c'
+            )
             
-            # 공개 URL 생성
-            blob.make_public()
+            # 공개 URL 생성 (ACL 설정은 업로드 완료 후 일괄 처리)
+            self._queue_make_public(blob, pending_blobs)
             public_url = blob.public_url
             
             print(f"✅ 색칠도안 Firebase Storage 업로드 완료: {public_url}")
@@ -264,50 +479,40 @@ class ImageCrawlerGenerator:
             print(f"❌ 색칠도안 Firebase Storage 업로드 실패: {e}")
             return f"local_coloring_page_{page_number}.png"
     
-    def generate_age_based_prompt(self, character_name: str, age_group: str, difficulty: str) -> str:
-        """연령별 프롬프트 생성 (캐릭터별 특화, 영어 전용)"""
+    def _upload_batch(self, files: list, blob_name: str, pending_blobs: list = None) -> str:
+        """(파일명, 바이트) 목록을 tar.gz 하나로 묶어 임시 파일 없이 스트리밍 업로드 (청크 단위 재개 가능 업로드)"""
+        try:
+            blob = self.bucket.blob(blob_name, chunk_size=UPLOAD_CHUNK_SIZE)
+            with blob.open('wb', content_type='application/gzip', retry=DEFAULT_RETRY) as writer, \
+                    tarfile.open(fileobj=writer, mode='w|gz') as tar:
+                for name, data in files:
+                    info = tarfile.TarInfo(name)
+                    info.size = len(data)
+                    tar.addfile(info, io.BytesIO(data))
+            
+            self._queue_make_public(blob, pending_blobs)
+            print(f"✅ 색칠도안 {len(files)}개 묶음 업로드 완료: {blob.public_url}")
+            return blob.public_url
+            
+        except Exception as e:
+            print(f"❌ 색칠도안 묶음 업로드 실패: {e}")
+            return None
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def generate_age_based_prompt(character_name: str, age_group: str, difficulty: str) -> str:
+        """연령별 프롬프트 생성 (캐릭터별 특화, 영어 전용, 결과 캐시)"""
         
         # 프롬프트 생성 규칙:
         # 1. 모든 텍스트는 영어로만 작성
         # 2. 한글 캐릭터 이름이나 제목 사용 금지
         # 3. 영어로만 캐릭터 특징 설명
         
-        # 캐릭터별 특화 설명 (영어만 사용)
-        character_descriptions = {
-            '하츄핑': "pink-haired character with heart decorations, crown tiara, pink dress with white top, cute chibi proportions, magical girl style, TiniPing character",
-            '라라핑': "blue-haired character with star decorations, crown tiara, blue dress, cute chibi proportions, magical girl style, TiniPing character", 
-            '바로핑': "yellow-haired character with sun decorations, crown tiara, yellow dress, cute chibi proportions, magical girl style, TiniPing character",
-            '차차핑': "green-haired character with leaf decorations, crown tiara, green dress, cute chibi proportions, magical girl style, TiniPing character",
-            '도라에몽': "blue robot cat with white belly, red collar with bell, round head, no ears, cute proportions, Doraemon character",
-            '미키마우스': "black mouse with large round ears, red shorts, yellow shoes, white gloves, Disney character",
-            '피카츄': "yellow electric mouse with red cheeks, brown stripes on back, black-tipped ears, Pokemon character",
-            '배트맨': "dark superhero with black cape, bat symbol on chest, pointy bat ears, muscular build, intimidating presence, DC Comics character",
-            '운빨존만겜': "lucky character with gambling theme, dice symbols, coin decorations, playful expression, game character style",
-            '아이언미야옹': "lucky gambling game character, cute cat with iron armor, mechanical elements, futuristic design, playful expression, distinctive helmet design, chest reactor, gaming mascot style"
-        }
-        
         # 기본 캐릭터 설명 (특화 설명이 없는 경우)
-        char_desc = character_descriptions.get(character_name, character_name)
-        
-        age_prompts = {
-            'child': {
-                'easy': f"{char_desc}, simple coloring page for children ages 3-6, thick bold outlines 5-6px, minimal details, large clear coloring areas, cute chibi proportions, friendly expression",
-                'medium': f"{char_desc}, coloring page for children ages 6-8, medium line weight 3-4px, moderate details, balanced complexity, dynamic pose, cheerful expression",
-                'hard': f"{char_desc}, detailed coloring page for children ages 8-10, fine line art 2-3px, intricate patterns, complex elements, expressive pose"
-            },
-            'teen': {
-                'easy': f"{char_desc}, teen-friendly coloring page ages 9-12, medium line weight 3-4px, clear outlines, moderate details, cool pose",
-                'medium': f"{char_desc}, detailed coloring page for teens ages 12-15, fine line art 2-3px, intricate details, dynamic composition, stylish pose",
-                'hard': f"{char_desc}, complex coloring page for teens ages 15+, very fine line art 1-2px, highly detailed design, sophisticated composition, dramatic pose"
-            },
-            'adult': {
-                'easy': f"{char_desc}, adult coloring page ages 16+, medium complexity, clean line art 2-3px, elegant design, sophisticated pose",
-                'medium': f"{char_desc}, detailed adult coloring page, fine line art 1-2px, intricate patterns, complex composition, artistic pose",
-                'hard': f"{char_desc}, highly detailed adult coloring page, very fine line art 1px, extremely intricate patterns, complex mandala-style elements, artistic masterpiece"
-            }
-        }
+        char_desc = CHARACTER_DESCRIPTIONS.get(character_name, character_name)
         
-        return age_prompts.get(age_group, {}).get(difficulty, f"{char_desc}, coloring page")
+        template = AGE_PROMPT_TEMPLATES.get((age_group, difficulty), "{char_desc}, coloring page")
+        return template.format(char_desc=char_desc)
     
     def optimize_prompt_with_gemini(self, prompt: str) -> str:
         """제미나이로 프롬프트 최적화"""
@@ -316,6 +521,12 @@ class ImageCrawlerGenerator:
                 print("⚠️ Gemini API 키가 없어서 원본 프롬프트를 사용합니다.")
                 return prompt
             
+            cache_key = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+            cached_prompt = _load_prompt_cache().get(cache_key)
+            if cached_prompt is not None:
+                print(f"✅ 캐시된 최적화 프롬프트 사용")
+                return cached_prompt
+            
             optimization_prompt = f"""
 다음 색칠놀이 도안 생성 프롬프트를 최적화해주세요:
 
@@ -357,18 +568,19 @@ class ImageCrawlerGenerator:
             
             url = f'https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={self.gemini_api_key}'
             
-            response = requests.post(
+            response = self.gemini_client.post(
                 url,
                 headers=headers,
-                json=data,
+                content=orjson.dumps(data),
                 timeout=30
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 if 'candidates' in result and len(result['candidates']) > 0:
                     optimized_prompt = result['candidates'][0]['content']['parts'][0]['text']
                     print(f"✅ 프롬프트 최적화 완료")
+                    _save_prompt_cache(cache_key, optimized_prompt)
                     return optimized_prompt
                 else:
                     print(f"⚠️ 응답 형식이 예상과 다릅니다: {result}")
@@ -381,8 +593,8 @@ class ImageCrawlerGenerator:
             print(f"❌ 프롬프트 최적화 실패: {e}")
             return prompt
     
-    def generate_coloring_page_with_gemini_image(self, prompt: str, reference_image_url: str, page_number: int = 1) -> str:
-        """제미나이 이미지 플래시로 색칠도안 생성"""
+    def generate_coloring_page_with_gemini_image(self, prompt: str, reference_image_url: str, page_number: int = 1) -> bytes:
+        """제미나이 이미지 플래시로 색칠도안 생성 (PNG 바이트 반환)"""
         try:
             if not self.gemini_api_key:
                 print("⚠️ Gemini API 키가 없어서 로컬 생성기를 사용합니다.")
@@ -399,23 +611,9 @@ class ImageCrawlerGenerator:
                 print("❌ 참조 이미지 변환 실패")
                 return self.generate_local_coloring_page(prompt)
             
-            # 이미지 생성 프롬프트 (다양성을 위한 변형 추가)
-            variations = [
-                "cute and friendly expression",
-                "happy and cheerful pose", 
-                "playful and energetic stance",
-                "calm and peaceful pose",
-                "excited and joyful expression",
-                "thoughtful and curious look",
-                "adventurous and brave pose",
-                "gentle and kind expression",
-                "funny and silly pose",
-                "confident and proud stance"
-            ]
-            
-            # 페이지 번호에 따라 다른 변형 사용
-            variation_index = (page_number - 1) % len(variations)
-            selected_variation = variations[variation_index]
+            # 이미지 생성 프롬프트 (페이지 번호에 따라 다른 변형 사용)
+            variation_index = (page_number - 1) % len(POSE_VARIATIONS)
+            selected_variation = POSE_VARIATIONS[variation_index]
             
             image_generation_prompt = f"""
 Create a coloring page based on the reference image:
@@ -462,15 +660,16 @@ Generate the coloring page image optimized for A4 printing.
             
             url = f'https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-image:generateContent?key={self.gemini_api_key}'
             
-            response = requests.post(
+            # 페이지별 타임아웃은 요청 자체에 적용 (초과 시 요청이 끊겨 과금/대기 없이 실패 처리)
+            response = self.gemini_client.post(
                 url,
                 headers=headers,
-                json=data,
-                timeout=60
+                content=orjson.dumps(data),
+                timeout=GEMINI_PAGE_TIMEOUT
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 print("✅ 제미나이 이미지 생성 API 호출 성공")
                 
                 # 응답에서 생성된 이미지 추출
@@ -479,9 +678,10 @@ Generate the coloring page image optimized for A4 printing.
                     if 'content' in candidate and 'parts' in candidate['content']:
                         for part in candidate['content']['parts']:
                             if 'inlineData' in part and part['inlineData']['mimeType'].startswith('image/'):
-                                generated_image_base64 = part['inlineData']['data']
+                                # 응답의 Base64는 여기서 한 번만 디코딩
+                                generated_image = base64.b64decode(part['inlineData']['data'])
                                 print("✅ 제미나이로 색칠도안 생성 완료")
-                                return generated_image_base64
+                                return generated_image
                 
                 print("❌ 응답에서 이미지를 찾을 수 없습니다. 생성 실패.")
                 return None
@@ -490,6 +690,9 @@ Generate the coloring page image optimized for A4 printing.
                 print(f"응답: {response.text}")
                 return None
                 
+        except httpx.TimeoutException:
+            print(f"⚠️ 제미나이 이미지 생성 시간 초과 ({GEMINI_PAGE_TIMEOUT}초)")
+            return None
         except Exception as e:
             print(f"❌ 제미나이 이미지 생성 실패: {e}")
             return None
@@ -497,41 +700,74 @@ Generate the coloring page image optimized for A4 printing.
     def image_to_base64(self, image_url: str) -> str:
         """이미지 URL을 Base64로 변환"""
         try:
-            if image_url.startswith('file://'):
-                image_path = image_url[7:]  # file:// 제거
-                with open(image_path, 'rb') as f:
-                    return base64.b64encode(f.read()).decode('utf-8')
+            if not image_url.startswith(('http://', 'https://')):
+                image_path = image_url.removeprefix('file://')  # 로컬 경로
+                # 파일을 메모리 매핑해 읽기 버퍼 복사 없이 인코딩
+                with open(image_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return base64.b64encode(mapped).decode('ascii')
             else:
-                response = requests.get(image_url)
-                return base64.b64encode(response.content).decode('utf-8')
+                # 3바이트 경계에 맞춘 청크 단위로 인코딩해 원본 전체를 버퍼링하지 않음
+                encoded = bytearray()
+                remainder = b''
+                with self.session.get(image_url, stream=True) as response:
+                    # 오류 응답 본문을 참조 이미지로 인코딩하지 않도록 상태 확인
+                    response.raise_for_status()
+                    for chunk in response.iter_content(chunk_size=BASE64_CHUNK_SIZE):
+                        chunk = remainder + chunk
+                        aligned = len(chunk) - len(chunk) % 3
+                        encoded += binascii.b2a_base64(chunk[:aligned], newline=False)
+                        remainder = chunk[aligned:]
+                encoded += binascii.b2a_base64(remainder, newline=False)
+                return encoded.decode('ascii')
         except Exception as e:
             print(f"❌ 이미지 Base64 변환 실패: {e}")
             return ""
     
-    def generate_local_coloring_page(self, prompt: str) -> str:
-        """로컬에서 색칠도안 생성 (OpenCV 사용)"""
+    def generate_local_coloring_page(self, prompt: str) -> bytes:
+        """로컬에서 색칠도안 생성 (PIL 사용)"""
         try:
+            from PIL import Image, ImageDraw
+            
             # 간단한 색칠도안 생성 (실제로는 더 복잡한 로직 필요)
-            img = np.ones((800, 600, 3), dtype=np.uint8) * 255  # 흰색 배경
+            img = Image.new('RGB', (600, 800), (255, 255, 255))  # 흰색 배경
+            draw = ImageDraw.Draw(img)
             
             # 검은색 윤곽선 그리기
-            cv2.rectangle(img, (50, 50), (550, 750), (0, 0, 0), 3)
-            cv2.circle(img, (300, 200), 80, (0, 0, 0), 3)
-            cv2.ellipse(img, (300, 400), (100, 150), 0, 0, 360, (0, 0, 0), 3)
+            draw.rectangle([50, 50, 550, 750], outline='black', width=3)
+            draw.ellipse([220, 120, 380, 280], outline='black', width=3)
+            draw.ellipse([200, 250, 400, 550], outline='black', width=3)
             
-            # Base64로 인코딩
-            _, buffer = cv2.imencode('.png', img)
-            img_base64 = base64.b64encode(buffer).decode('utf-8')
+            # PNG 바이트로 저장
+            buffer = io.BytesIO()
+            img.save(buffer, 'PNG', optimize=False, compress_level=1)
             
             print("✅ 로컬 색칠도안 생성 완료")
-            return img_base64
+            return buffer.getvalue()
             
         except Exception as e:
             print(f"❌ 로컬 색칠도안 생성 실패: {e}")
-            return ""
+            return b""
+    
+    def _download_and_upload(self, index: int, img_info: dict, character_name: str, pending_blobs: list) -> dict:
+        """참조 이미지 하나를 다운로드 후 Firebase Storage에 업로드 (업로드한 blob은 pending_blobs에 추가)"""
+        filename = f"{character_name}_{index+1}.jpg"
+        thumbnail_url = img_info.get('thumbnail')
+        local_path = self.download_image(img_info['url'], filename, thumbnail_url)
+        
+        if not local_path:
+            return None
+        
+        firebase_url = self.upload_to_firebase_storage(local_path, character_name, pending_blobs)
+        return {
+            'local_path': local_path,
+            'firebase_url': firebase_url,
+            'title': img_info['title']
+        }
     
-    def generate_coloring_pages(self, character_name: str, age_group: str = 'child', difficulty: str = 'easy', count: int = 10):
-        """색칠놀이 도안 생성 메인 함수"""
+    def generate_coloring_pages(self, character_name: str, age_group: str = 'child', difficulty: str = 'easy', count: int = 10, return_data: bool = False, include_base64: bool = True, upload_workers: int = UPLOAD_WORKERS, batch_upload: bool = False):
+        """색칠놀이 도안 생성 메인 함수 (return_data=True면 파일 저장 없이 결과 dict 반환,
+        include_base64=False면 결과에 도안 Base64를 넣지 않음, upload_workers=0이면 순차 업로드,
+        batch_upload=True면 도안 전체를 tar.gz 하나로 업로드)"""
         print(f"\n🎨 {character_name} 색칠놀이 도안 생성 시작")
         print(f"연령대: {age_group}, 난이도: {difficulty}, 개수: {count}")
         
@@ -541,20 +777,27 @@ Generate the coloring page image optimized for A4 printing.
         
         # 2. 이미지 다운로드 및 Firebase Storage 업로드
         print("\n2️⃣ 이미지 다운로드 및 업로드 중...")
-        uploaded_images = []
-        
-        for i, img_info in enumerate(image_urls):
-            filename = f"{character_name}_{i+1}.jpg"
-            thumbnail_url = img_info.get('thumbnail')
-            local_path = self.download_image(img_info['url'], filename, thumbnail_url)
-            
-            if local_path:
-                firebase_url = self.upload_to_firebase_storage(local_path, character_name)
-                uploaded_images.append({
-                    'local_path': local_path,
-                    'firebase_url': firebase_url,
-                    'title': img_info['title']
-                })
+        # 같은 URL은 한 번만 다운로드/업로드
+        processed_urls = set()
+        unique_images = []
+        for img_info in image_urls:
+            if img_info['url'] not in processed_urls:
+                processed_urls.add(img_info['url'])
+                unique_images.append(img_info)
+        
+        # 공개 ACL 대기 blob은 호출별 목록에 모아 동시 실행 중인 다른 호출과 섞이지 않게 함
+        reference_blobs = []
+        page_blobs = []
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [
+                executor.submit(self._download_and_upload, i, img_info, character_name, reference_blobs)
+                for i, img_info in enumerate(unique_images)
+            ]
+            uploaded_images = [uploaded for uploaded in (f.result() for f in futures) if uploaded]
+        
+        # 참조 이미지는 제미나이가 URL로 읽어야 하므로 생성 전에 공개 ACL 설정
+        self.publish_pending_blobs(reference_blobs)
         
         # 3. 연령별 프롬프트 생성
         print("\n3️⃣ 연령별 프롬프트 생성 중...")
@@ -568,70 +811,125 @@ Generate the coloring page image optimized for A4 printing.
         print("\n5️⃣ 색칠도안 생성 중...")
         generated_pages = []
         
-        for i in range(count):
-            print(f"  생성 중: {i+1}/{count}")
-            
-            # 참조 이미지 선택 (순환)
+        # 파일명/생성 시각은 배치 시작 시 한 번만 계산
+        started_at = datetime.now()
+        batch_timestamp = started_at.strftime("%Y%m%d_%H%M%S")
+        generated_at = started_at.isoformat()
+        
+        # 참조 이미지 선택 (순환)
+        def select_reference(i):
             if uploaded_images:
-                ref_image = uploaded_images[i % len(uploaded_images)]
-            else:
-                # 업로드된 이미지가 없는 경우 기본 이미지 사용
-                ref_image = {'firebase_url': 'test_images/도라에몽_test.png'}
-            
+                return uploaded_images[i % len(uploaded_images)]
+            # 업로드된 이미지가 없는 경우 기본 이미지 사용
+            return {'firebase_url': 'test_images/도라에몽_test.png'}
+        
+        def generate_page(i, ref_image):
+            print(f"  생성 중: {i+1}/{count}")
+            self.gemini_rate_limiter.acquire()
             # 제미나이 이미지 플래시로 색칠도안 생성
-            coloring_page_base64 = self.generate_coloring_page_with_gemini_image(
-                optimized_prompt, 
+            return self.generate_coloring_page_with_gemini_image(
+                optimized_prompt,
                 ref_image['firebase_url'],
                 i + 1  # 페이지 번호 전달
             )
-            
-            # 생성 실패한 경우 건너뛰기
-            if not coloring_page_base64:
-                print(f"  ❌ 페이지 {i+1} 생성 실패 - 건너뛰기")
-                continue
-            
-            # 색칠도안을 Firebase Storage에 업로드
-            coloring_page_url = self.upload_coloring_page_to_firebase(
-                coloring_page_base64,
-                character_name,
-                age_group,
-                difficulty,
-                i + 1
+        
+        # 묶음 업로드면 페이지를 모았다가 한 번에 업로드
+        batch_files = [] if batch_upload and self.bucket else None
+        
+        # 업로드는 별도 풀에서 진행해 다음 페이지 생성과 겹치게 처리
+        upload_executor = ThreadPoolExecutor(max_workers=upload_workers) if upload_workers > 0 and batch_files is None else None
+        page_uploads = []
+        
+        # FETCH_BATCH_SIZE개씩 동시에 요청하고, 배치가 끝나면 다음 배치 제출
+        with ThreadPoolExecutor(max_workers=FETCH_BATCH_SIZE) as executor:
+            for batch_start in range(0, count, FETCH_BATCH_SIZE):
+                batch = []
+                for i in range(batch_start, min(batch_start + FETCH_BATCH_SIZE, count)):
+                    ref_image = select_reference(i)
+                    batch.append((i, ref_image, executor.submit(generate_page, i, ref_image)))
+                
+                for i, ref_image, future in batch:
+                    coloring_page_bytes = future.result()
+                    
+                    # 생성 실패한 경우 건너뛰기
+                    if not coloring_page_bytes:
+                        print(f"  ❌ 페이지 {i+1} 생성 실패 - 건너뛰기")
+                        continue
+                    
+                    # 색칠도안을 Firebase Storage에 업로드
+                    upload_args = (coloring_page_bytes, character_name, age_group, difficulty, i + 1, batch_timestamp, page_blobs)
+                    if batch_files is not None:
+                        upload = None
+                        coloring_page_url = None
+                        batch_files.append((f"{character_name}_page_{i+1:02d}_{batch_timestamp}.png", coloring_page_bytes))
+                    elif upload_executor:
+                        upload = upload_executor.submit(self.upload_coloring_page_to_firebase, *upload_args)
+                        coloring_page_url = None
+                    else:
+                        upload = None
+                        coloring_page_url = self.upload_coloring_page_to_firebase(*upload_args)
+                    
+                    page = {
+                        'page_number': i + 1,
+                        'character_name': character_name,
+                        'age_group': age_group,
+                        'difficulty': difficulty,
+                        'prompt': optimized_prompt,
+                        'reference_image': ref_image['firebase_url'],
+                        'generated_image_url': coloring_page_url,
+                        'generated_at': generated_at
+                    }
+                    if include_base64:
+                        page['generated_image_base64'] = base64.b64encode(coloring_page_bytes).decode('ascii')
+                    generated_pages.append(page)
+                    if upload:
+                        page_uploads.append((page, upload))
+        
+        # 남은 업로드 완료 대기 후 URL 기록
+        if upload_executor:
+            for page, upload in page_uploads:
+                page['generated_image_url'] = upload.result()
+            upload_executor.shutdown()
+        
+        if batch_files:
+            archive_url = self._upload_batch(
+                batch_files,
+                f"coloring_pages/{age_group}/{difficulty}/{character_name}/{character_name}_{batch_timestamp}.tar.gz",
+                page_blobs
             )
-            
-            generated_pages.append({
-                'page_number': i + 1,
-                'character_name': character_name,
-                'age_group': age_group,
-                'difficulty': difficulty,
-                'prompt': optimized_prompt,
-                'reference_image': ref_image['firebase_url'],
-                'generated_image_base64': coloring_page_base64,
-                'generated_image_url': coloring_page_url,
-                'generated_at': datetime.now().isoformat()
-            })
-            
-            # API 호출 간격 조절
-            time.sleep(2)
+            for page, (member_name, _) in zip(generated_pages, batch_files):
+                page['generated_image_url'] = archive_url
+                page['archive_member'] = member_name
         
-        # 6. 결과 저장
-        print("\n6️⃣ 결과 저장 중...")
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        result_file = f"coloring_pages_{character_name}_{timestamp}.json"
+        # 이번 호출에서 업로드된 색칠도안 공개 ACL 일괄 설정
+        self.publish_pending_blobs(page_blobs)
         
         result_data = {
             'character_name': character_name,
             'age_group': age_group,
             'difficulty': difficulty,
             'total_pages': count,
-            'generated_at': datetime.now().isoformat(),
+            'generated_at': generated_at,
             'prompt_used': optimized_prompt,
             'reference_images': uploaded_images,
             'generated_pages': generated_pages
         }
         
-        with open(result_file, 'w', encoding='utf-8') as f:
-            json.dump(result_data, f, ensure_ascii=False, indent=2)
+        # 호출자가 결과를 바로 사용하는 경우 파일 저장/재파싱 생략
+        if return_data:
+            print(f"✅ 색칠놀이 도안 생성 완료!")
+            print(f"📊 생성된 도안: {count}개")
+            return result_data
+        
+        # 6. 결과 저장
+        print("\n6️⃣ 결과 저장 중...")
+        result_file = f"coloring_pages_{character_name}_{age_group}_{difficulty}_{batch_timestamp}.json"
+        
+        with open(result_file, 'wb') as f:
+            f.write(orjson.dumps(
+                result_data,
+                option=orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if DEBUG else 0)
+            ))
         
         print(f"✅ 색칠놀이 도안 생성 완료!")
         print(f"📁 결과 파일: {result_file}")
@@ -5,12 +5,131 @@
 """
 
 import argparse
+import errno
+import shutil
+import subprocess
 import sys
 import os
+import threading
 from datetime import datetime
-from image_crawler_generator import ImageCrawlerGenerator
 
-def main():
+# 이번 프로세스에서 이미 만든 디렉토리 (makedirs의 상위 경로 stat 반복 방지)
+_created_dirs = set()
+
+def _mkdir_once(path: str):
+    """디렉토리를 프로세스당 한 번만 생성"""
+    if path not in _created_dirs:
+        os.makedirs(path, exist_ok=True)
+        _created_dirs.add(path)
+
+def _forward_stream(stream, target):
+    """자식 프로세스 출력을 줄 단위로 바로 전달"""
+    for line in stream:
+        target.write(line)
+        target.flush()
+    stream.close()
+
+def _move_file(src: str, dst: str):
+    """같은 파일시스템이면 rename으로 이동, 아니면 버퍼 복사 후 원본 삭제 (메타데이터 복사 생략)"""
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            shutil.copyfileobj(fsrc, fdst, length=1024 * 1024)
+        os.unlink(src)
+
+def run(character: str, count: int = 10, age_group: str = 'child', difficulty: str = 'easy',
+        output_dir: str = 'production_output', no_firebase: bool = False,
+        extract_images: bool = False, upload_workers: int = 4,
+        batch_upload: bool = False) -> str:
+    """색칠놀이 도안 제작 실행 (성공 시 결과 파일 경로, 실패 시 None 반환)"""
+    # 출력 디렉토리 생성
+    _mkdir_once(output_dir)
+    
+    # 진행 정보는 모아서 한 번에 출력
+    sys.stdout.write("\n".join([
+        f"🎨 색칠놀이 도안 제작 시작",
+        f"=" * 50,
+        f"캐릭터: {character}",
+        f"연령대: {age_group}",
+        f"난이도: {difficulty}",
+        f"개수: {count}",
+        f"출력 디렉토리: {output_dir}",
+        f"Firebase 업로드: {'비활성화' if no_firebase else '활성화'}",
+        ""
+    ]) + "\n")
+    sys.stdout.flush()
+    
+    # 생성기 초기화 (무거운 모듈은 실제 사용 시점에 로드)
+    from image_crawler_generator import ImageCrawlerGenerator
+    generator = ImageCrawlerGenerator()
+    
+    # Firebase 업로드 비활성화 (옵션)
+    if no_firebase:
+        generator.bucket = None
+    
+    # 색칠놀이 도안 생성
+    result_file = generator.generate_coloring_pages(
+        character_name=character,
+        age_group=age_group,
+        difficulty=difficulty,
+        count=count,
+        include_base64=extract_images,
+        upload_workers=0 if no_firebase else upload_workers,
+        batch_upload=batch_upload
+    )
+    
+    if not result_file:
+        print(f"\n❌ 색칠놀이 도안 생성 실패")
+        return None
+    
+    sys.stdout.write(f"\n✅ 색칠놀이 도안 생성 완료!\n📁 결과 파일: {result_file}\n")
+    
+    # 결과 파일을 출력 디렉토리로 이동
+    dest_file = os.path.join(output_dir, os.path.basename(result_file))
+    _move_file(result_file, dest_file)
+    print(f"📁 이동 완료: {dest_file}")
+    
+    # 이미지 추출 (옵션)
+    if extract_images:
+        print(f"\n🖼️ 이미지 추출 중...")
+        extract_dir = os.path.join(output_dir, 'extracted_images')
+        _mkdir_once(extract_dir)
+        
+        # extract_images.py 실행 (작업 디렉토리를 extract_dir로 변경, 출력은 버퍼링 없이 바로 전달)
+        script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'utils', 'extract_images.py')
+        proc = subprocess.Popen(
+            [sys.executable, script_path, os.path.abspath(dest_file)],
+            cwd=extract_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1
+        )
+        forwarders = [
+            threading.Thread(target=_forward_stream, args=(proc.stdout, sys.stdout), daemon=True),
+            threading.Thread(target=_forward_stream, args=(proc.stderr, sys.stderr), daemon=True)
+        ]
+        for forwarder in forwarders:
+            forwarder.start()
+        
+        returncode = proc.wait()
+        for forwarder in forwarders:
+            forwarder.join()
+        
+        if returncode == 0:
+            print(f"✅ 이미지 추출 완료: {extract_dir}")
+        else:
+            print(f"❌ 이미지 추출 실패 (종료 코드 {returncode})")
+    
+    sys.stdout.write(f"\n🎉 제작 완료!\n📊 생성된 도안: {count}개\n📁 출력 위치: {output_dir}\n")
+    sys.stdout.flush()
+    
+    return dest_file
+
+def main(argv=None):
     parser = argparse.ArgumentParser(description='색칠놀이 도안 제작 도구')
     
     # 필수 인자
@@ -38,79 +157,35 @@ def main():
     parser.add_argument('--no-firebase', action='store_true',
                        help='Firebase Storage 업로드 비활성화')
     
+    parser.add_argument('--upload-workers', type=int, default=4,
+                       help='색칠도안 동시 업로드 수 (기본값: 4)')
+    parser.add_argument('--batch-upload', action='store_true',
+                       help='색칠도안을 페이지별 대신 tar.gz 하나로 묶어 업로드')
+    
     # 이미지 추출 옵션
     parser.add_argument('--extract-images', action='store_true',
                        help='생성 후 이미지 추출')
     
-    args = parser.parse_args()
-    
-    # 출력 디렉토리 생성
-    os.makedirs(args.output_dir, exist_ok=True)
-    
-    print(f"🎨 색칠놀이 도안 제작 시작")
-    print(f"=" * 50)
-    print(f"캐릭터: {args.character}")
-    print(f"연령대: {args.age_group}")
-    print(f"난이도: {args.difficulty}")
-    print(f"개수: {args.count}")
-    print(f"출력 디렉토리: {args.output_dir}")
-    print(f"Firebase 업로드: {'비활성화' if args.no_firebase else '활성화'}")
-    print()
+    args = parser.parse_args(argv)
     
     try:
-        # 생성기 초기화
-        generator = ImageCrawlerGenerator()
-        
-        # Firebase 업로드 비활성화 (옵션)
-        if args.no_firebase:
-            generator.bucket = None
-        
-        # 색칠놀이 도안 생성
-        result_file = generator.generate_coloring_pages(
-            character_name=args.character,
+        dest_file = run(
+            character=args.character,
+            count=args.count,
             age_group=args.age_group,
             difficulty=args.difficulty,
-            count=args.count
+            output_dir=args.output_dir,
+            no_firebase=args.no_firebase,
+            extract_images=args.extract_images,
+            upload_workers=args.upload_workers,
+            batch_upload=args.batch_upload
         )
-        
-        if result_file:
-            print(f"\n✅ 색칠놀이 도안 생성 완료!")
-            print(f"📁 결과 파일: {result_file}")
-            
-            # 결과 파일을 출력 디렉토리로 이동
-            import shutil
-            dest_file = os.path.join(args.output_dir, os.path.basename(result_file))
-            shutil.move(result_file, dest_file)
-            print(f"📁 이동 완료: {dest_file}")
-            
-            # 이미지 추출 (옵션)
-            if args.extract_images:
-                print(f"\n🖼️ 이미지 추출 중...")
-                extract_dir = os.path.join(args.output_dir, 'extracted_images')
-                os.makedirs(extract_dir, exist_ok=True)
-                
-                # extract_images.py 실행 (작업 디렉토리를 extract_dir로 변경)
-                import subprocess
-                result = subprocess.run([
-                    'python3', 'utils/extract_images.py', dest_file
-                ], cwd=extract_dir, capture_output=True, text=True)
-                
-                if result.returncode == 0:
-                    print(f"✅ 이미지 추출 완료: {extract_dir}")
-                else:
-                    print(f"❌ 이미지 추출 실패: {result.stderr}")
-            
-            print(f"\n🎉 제작 완료!")
-            print(f"📊 생성된 도안: {args.count}개")
-            print(f"📁 출력 위치: {args.output_dir}")
-            
-        else:
-            print(f"\n❌ 색칠놀이 도안 생성 실패")
-            sys.exit(1)
-            
     except Exception as e:
         print(f"\n❌ 오류 발생: {e}")
         sys.exit(1)
+    
+    if not dest_file:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
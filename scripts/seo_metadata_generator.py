@@ -4,15 +4,56 @@ SEO 최적화된 다국어 메타데이터 생성기
 5개 언어 지원: 한국어, 영어, 스페인어, 일본어, 중국어
 """
 
-import json
+import functools
+import itertools
+import orjson
 import re
+import sys
 from typing import Dict, List, Any
 from datetime import datetime
 from image_crawler_generator import ImageCrawlerGenerator
 
+# URL 친화적인 파일명에 허용되지 않는 문자
+_SAFE_CHAR_RE = re.compile(r'[^\w\-]')
+
+# 언어별 SEO 제목 템플릿
+TITLE_TEMPLATES = {
+    'ko': "{character_name} 색칠놀이 도안 {page_number} - {age_group}용 {difficulty} 난이도",
+    'en': "{character_name} Coloring Page {page_number} - {age_group} {difficulty} difficulty",
+    'es': "Página para colorear {character_name} {page_number} - {age_group} dificultad {difficulty}",
+    'ja': "{character_name} ぬりえ {page_number} - {age_group} {difficulty} 難易度",
+    'zh': "{character_name} 涂色页 {page_number} - {age_group} {difficulty} 难度"
+}
+
+# 언어별 SEO 설명 템플릿
+DESCRIPTION_TEMPLATES = {
+    'ko': "{character_name} 캐릭터의 {age_group}을 위한 {difficulty} 난이도 색칠놀이 도안입니다. A4 사이즈로 프린트 가능하며, 창의력과 집중력을 기를 수 있습니다.",
+    'en': "High-quality {difficulty} difficulty coloring page featuring {character_name} character, perfect for {age_group}. A4 print-ready format for creative and educational activities.",
+    'es': "Página para colorear de alta calidad con el personaje {character_name}, perfecta para {age_group} con dificultad {difficulty}. Formato A4 listo para imprimir.",
+    'ja': "{character_name}キャラクターの{difficulty}難易度ぬりえです。{age_group}向けで、A4サイズで印刷可能です。創造性と集中力を育みます。",
+    'zh': "高质量{character_name}角色涂色页，适合{age_group}，{difficulty}难度。A4尺寸，可打印，培养创造力和专注力。"
+}
+
+# 언어별 alt 텍스트 템플릿
+ALT_TEXT_TEMPLATES = {
+    'ko': "{character_name} 캐릭터 {age_group}용 색칠놀이 도안",
+    'en': "{character_name} character coloring page for {age_group}",
+    'es': "Página para colorear del personaje {character_name} para {age_group}",
+    'ja': "{character_name}キャラクターの{age_group}向けぬりえ",
+    'zh': "{character_name}角色{age_group}涂色页"
+}
+
+@functools.lru_cache(maxsize=128)
+def _safe_name(name: str) -> str:
+    """URL 친화적인 캐릭터 이름 (결과 캐시)"""
+    return _SAFE_CHAR_RE.sub('', name.lower())
+
 class SEOMetadataGenerator:
-    def __init__(self):
+    def __init__(self, generated_at: str = None):
         self.generator = ImageCrawlerGenerator()
+        
+        # 실행 단위 생성 시각 (페이지/언어마다 다시 계산하지 않음)
+        self._run_ts = generated_at or datetime.now().isoformat()
         self.languages = {
             'ko': '한국어',
             'en': 'English', 
@@ -52,10 +93,34 @@ class SEOMetadataGenerator:
                 'zh': ['米老鼠', '迪士尼', '涂色页', '老鼠', '卡通', '经典']
             }
         }
+        
+        # (캐릭터, 언어) -> 키워드 튜플로 평탄화한 조회 테이블
+        self._kw_flat = {
+            (character, lang_code): tuple(keywords)
+            for character, langs in self.character_keywords.items()
+            for lang_code, keywords in langs.items()
+        }
+        
+        # (캐릭터, 연령대, 난이도, 언어) -> 결합된 전체 키워드 튜플 (처음 사용 시 채움)
+        self._all_kw = {}
+    
+    def generate_seo_metadata_batch(self, cases: List[tuple]) -> List[Dict[str, Any]]:
+        """(캐릭터, 연령대, 난이도, 이미지 URL, 페이지 번호) 목록의 메타데이터를 한 번에 생성"""
+        
+        # 연령대/난이도 키워드를 (연령대, 난이도, 언어) 조합별로 미리 결합
+        level_pairs = {(age_group, difficulty) for _, age_group, difficulty, *_ in cases}
+        level_keywords = {
+            (age_group, difficulty, lang_code):
+                self._get_age_keywords(age_group, lang_code) + self._get_difficulty_keywords(difficulty, lang_code)
+            for (age_group, difficulty), lang_code in itertools.product(level_pairs, self.languages)
+        }
+        
+        return [self.generate_seo_metadata(*case, level_keywords=level_keywords) for case in cases]
     
     def generate_seo_metadata(self, character_name: str, age_group: str, difficulty: str, 
-                            image_url: str, page_number: int = 1) -> Dict[str, Any]:
-        """SEO 최적화된 다국어 메타데이터 생성"""
+                            image_url: str, page_number: int = 1,
+                            level_keywords: Dict[tuple, tuple] = None) -> Dict[str, Any]:
+        """SEO 최적화된 다국어 메타데이터 생성 (level_keywords는 배치 생성 시 미리 결합한 키워드)"""
         
         # 기본 정보
         base_info = {
@@ -64,7 +129,7 @@ class SEOMetadataGenerator:
             'difficulty': difficulty,
             'page_number': page_number,
             'image_url': image_url,
-            'generated_at': datetime.now().isoformat(),
+            'generated_at': self._run_ts,
             'print_size': 'A4',
             'resolution': '300DPI',
             'dimensions': {
@@ -75,13 +140,13 @@ class SEOMetadataGenerator:
         }
         
         # 다국어 메타데이터 생성
-        multilingual_metadata = {}
-        
-        for lang_code, lang_name in self.languages.items():
-            metadata = self._generate_language_metadata(
-                character_name, age_group, difficulty, page_number, lang_code
+        multilingual_metadata = {
+            lang_code: self._generate_language_metadata(
+                character_name, age_group, difficulty, page_number, lang_code,
+                level_keywords.get((age_group, difficulty, lang_code)) if level_keywords else None
             )
-            multilingual_metadata[lang_code] = metadata
+            for lang_code in self.languages
+        }
         
         return {
             'base_info': base_info,
@@ -91,18 +156,21 @@ class SEOMetadataGenerator:
         }
     
     def _generate_language_metadata(self, character_name: str, age_group: str, 
-                                  difficulty: str, page_number: int, lang_code: str) -> Dict[str, Any]:
+                                  difficulty: str, page_number: int, lang_code: str,
+                                  level_keywords: tuple = None) -> Dict[str, Any]:
         """특정 언어의 메타데이터 생성"""
         
         # 캐릭터별 키워드 가져오기
-        keywords = self.character_keywords.get(character_name, {}).get(lang_code, [character_name])
-        
-        # 연령대별 키워드 추가
-        age_keywords = self._get_age_keywords(age_group, lang_code)
-        difficulty_keywords = self._get_difficulty_keywords(difficulty, lang_code)
+        character_keywords = self._kw_flat.get((character_name, lang_code), ())
+        keywords = character_keywords or (character_name,)
         
-        # 모든 키워드 결합
-        all_keywords = keywords + age_keywords + difficulty_keywords
+        # 모든 키워드 결합 (캐릭터 + 연령대별 + 난이도별, 조합별로 한 번만)
+        kw_key = (character_name, age_group, difficulty, lang_code)
+        all_keywords = self._all_kw.get(kw_key)
+        if all_keywords is None:
+            if level_keywords is None:
+                level_keywords = self._get_age_keywords(age_group, lang_code) + self._get_difficulty_keywords(difficulty, lang_code)
+            all_keywords = self._all_kw.setdefault(kw_key, keywords + level_keywords)
         
         # 제목 생성
         title = self._generate_title(character_name, age_group, difficulty, page_number, lang_code)
@@ -128,7 +196,8 @@ class SEOMetadataGenerator:
         
         # 구조화된 데이터 (JSON-LD)
         structured_data = self._generate_structured_data(
-            character_name, age_group, difficulty, page_number, lang_code, title, description
+            character_name, age_group, difficulty, page_number, lang_code, title, description,
+            character_keywords
         )
         
         return {
@@ -138,8 +207,10 @@ class SEOMetadataGenerator:
             'file_naming': self._generate_file_naming(character_name, page_number, lang_code)
         }
     
-    def _get_age_keywords(self, age_group: str, lang_code: str) -> List[str]:
-        """연령대별 키워드"""
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _get_age_keywords(age_group: str, lang_code: str) -> tuple:
+        """연령대별 키워드 (결과 캐시)"""
         age_keywords = {
             'child': {
                 'ko': ['어린이', '유아', '색칠공부', '교육'],
@@ -164,10 +235,12 @@ class SEOMetadataGenerator:
             }
         }
         
-        return age_keywords.get(age_group, {}).get(lang_code, [])
+        return tuple(age_keywords.get(age_group, {}).get(lang_code, ()))
     
-    def _get_difficulty_keywords(self, difficulty: str, lang_code: str) -> List[str]:
-        """난이도별 키워드"""
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _get_difficulty_keywords(difficulty: str, lang_code: str) -> tuple:
+        """난이도별 키워드 (결과 캐시)"""
         difficulty_keywords = {
             'easy': {
                 'ko': ['쉬운', '초급', '간단한', '기본'],
@@ -192,54 +265,51 @@ class SEOMetadataGenerator:
             }
         }
         
-        return difficulty_keywords.get(difficulty, {}).get(lang_code, [])
+        return tuple(difficulty_keywords.get(difficulty, {}).get(lang_code, ()))
     
-    def _generate_title(self, character_name: str, age_group: str, 
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _generate_title(character_name: str, age_group: str, 
                        difficulty: str, page_number: int, lang_code: str) -> str:
-        """SEO 최적화된 제목 생성"""
+        """SEO 최적화된 제목 생성 (결과 캐시)"""
         
-        titles = {
-            'ko': f"{character_name} 색칠놀이 도안 {page_number} - {age_group}용 {difficulty} 난이도",
-            'en': f"{character_name} Coloring Page {page_number} - {age_group} {difficulty} difficulty",
-            'es': f"Página para colorear {character_name} {page_number} - {age_group} dificultad {difficulty}",
-            'ja': f"{character_name} ぬりえ {page_number} - {age_group} {difficulty} 難易度",
-            'zh': f"{character_name} 涂色页 {page_number} - {age_group} {difficulty} 难度"
-        }
-        
-        return titles.get(lang_code, titles['en'])
+        template = TITLE_TEMPLATES.get(lang_code, TITLE_TEMPLATES['en'])
+        return template.format_map({
+            'character_name': character_name,
+            'age_group': age_group,
+            'difficulty': difficulty,
+            'page_number': page_number
+        })
     
-    def _generate_description(self, character_name: str, age_group: str, 
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _generate_description(character_name: str, age_group: str, 
                             difficulty: str, lang_code: str) -> str:
-        """SEO 최적화된 설명 생성"""
-        
-        descriptions = {
-            'ko': f"{character_name} 캐릭터의 {age_group}을 위한 {difficulty} 난이도 색칠놀이 도안입니다. A4 사이즈로 프린트 가능하며, 창의력과 집중력을 기를 수 있습니다.",
-            'en': f"High-quality {difficulty} difficulty coloring page featuring {character_name} character, perfect for {age_group}. A4 print-ready format for creative and educational activities.",
-            'es': f"Página para colorear de alta calidad con el personaje {character_name}, perfecta para {age_group} con dificultad {difficulty}. Formato A4 listo para imprimir.",
-            'ja': f"{character_name}キャラクターの{difficulty}難易度ぬりえです。{age_group}向けで、A4サイズで印刷可能です。創造性と集中力を育みます。",
-            'zh': f"高质量{character_name}角色涂色页，适合{age_group}，{difficulty}难度。A4尺寸，可打印，培养创造力和专注力。"
-        }
+        """SEO 최적화된 설명 생성 (결과 캐시)"""
         
-        return descriptions.get(lang_code, descriptions['en'])
+        template = DESCRIPTION_TEMPLATES.get(lang_code, DESCRIPTION_TEMPLATES['en'])
+        return template.format_map({
+            'character_name': character_name,
+            'age_group': age_group,
+            'difficulty': difficulty
+        })
     
-    def _generate_alt_text(self, character_name: str, age_group: str, lang_code: str) -> str:
-        """접근성을 위한 alt 텍스트 생성"""
-        
-        alt_texts = {
-            'ko': f"{character_name} 캐릭터 {age_group}용 색칠놀이 도안",
-            'en': f"{character_name} character coloring page for {age_group}",
-            'es': f"Página para colorear del personaje {character_name} para {age_group}",
-            'ja': f"{character_name}キャラクターの{age_group}向けぬりえ",
-            'zh': f"{character_name}角色{age_group}涂色页"
-        }
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _generate_alt_text(character_name: str, age_group: str, lang_code: str) -> str:
+        """접근성을 위한 alt 텍스트 생성 (결과 캐시)"""
         
-        return alt_texts.get(lang_code, alt_texts['en'])
+        template = ALT_TEXT_TEMPLATES.get(lang_code, ALT_TEXT_TEMPLATES['en'])
+        return template.format_map({
+            'character_name': character_name,
+            'age_group': age_group
+        })
     
     def _generate_file_naming(self, character_name: str, page_number: int, lang_code: str) -> Dict[str, str]:
         """다국어 파일명 생성"""
         
         # URL 친화적인 파일명
-        safe_character = re.sub(r'[^\w\-]', '', character_name.lower())
+        safe_character = _safe_name(character_name)
         
         return {
             'filename': f"{safe_character}_page_{page_number:02d}_{lang_code}",
@@ -249,8 +319,8 @@ class SEOMetadataGenerator:
     
     def _generate_structured_data(self, character_name: str, age_group: str, 
                                 difficulty: str, page_number: int, lang_code: str,
-                                title: str, description: str) -> Dict[str, Any]:
-        """JSON-LD 구조화된 데이터 생성"""
+                                title: str, description: str, keywords: tuple = ()) -> Dict[str, Any]:
+        """JSON-LD 구조화된 데이터 생성 (중첩 객체도 호출마다 새로 만들어 페이지 간에 공유하지 않음)"""
         
         return {
             "@context": "https://schema.org",
@@ -278,8 +348,8 @@ class SEOMetadataGenerator:
                 "width": 2480,
                 "height": 3508
             },
-            "keywords": self.character_keywords.get(character_name, {}).get(lang_code, []),
-            "dateCreated": datetime.now().isoformat(),
+            "keywords": list(keywords),
+            "dateCreated": self._run_ts,
             "isAccessibleForFree": True,
             "learningResourceType": "coloring page",
             "educationalLevel": age_group
@@ -299,24 +369,26 @@ def main():
         ('도라에몽', 'adult', 'hard', 'https://example.com/doraemon.jpg', 3)
     ]
     
-    for character, age_group, difficulty, image_url, page_num in test_cases:
-        print(f"\n🎯 {character} ({age_group}, {difficulty}) 메타데이터 생성 중...")
-        
-        metadata = generator.generate_seo_metadata(
-            character, age_group, difficulty, image_url, page_num
-        )
+    print(f"\n🎯 {len(test_cases)}개 메타데이터 일괄 생성 중...")
+    batch_metadata = generator.generate_seo_metadata_batch(test_cases)
+    
+    for (character, age_group, difficulty, image_url, page_num), metadata in zip(test_cases, batch_metadata):
+        print(f"\n🎯 {character} ({age_group}, {difficulty}) 메타데이터")
         
         # 결과 저장
         filename = f"seo_metadata_{character}_{page_num}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        with open(filename, 'wb', buffering=1024 * 1024) as f:
+            f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
         
         print(f"✅ 메타데이터 생성 완료: {filename}")
         
         # 샘플 출력
-        print(f"📝 한국어 제목: {metadata['multilingual_metadata']['ko']['seo_metadata']['title']}")
-        print(f"📝 영어 제목: {metadata['multilingual_metadata']['en']['seo_metadata']['title']}")
-        print(f"📝 일본어 제목: {metadata['multilingual_metadata']['ja']['seo_metadata']['title']}")
+        multilingual = metadata['multilingual_metadata']
+        sys.stdout.write(
+            f"📝 한국어 제목: {multilingual['ko']['seo_metadata']['title']}\n"
+            f"📝 영어 제목: {multilingual['en']['seo_metadata']['title']}\n"
+            f"📝 일본어 제목: {multilingual['ja']['seo_metadata']['title']}\n"
+        )
 
 if __name__ == "__main__":
     main()
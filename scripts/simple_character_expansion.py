@@ -5,9 +5,25 @@
 """
 
 import json
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List
 
 class SimpleCharacterExpansion:
+    # 패턴별 변형 접두사와 이름 형식 (마우스는 고정 목록)
+    _VARIATION_TABLE = {
+        '핑': (('라라', '바로', '차차', '토토', '코코', '모모', '루루', '뽀뽀'), '{p}핑'),  # 하츄핑 → 라라핑, 바로핑, 차차핑 등
+        '미야옹': (('골드', '실버', '브론즈', '다이아', '루비', '사파이어', '에메랄드'), '{p}미야옹'),  # 아이언미야옹 → 다른 미야옹들
+        '맨': (('슈퍼', '스파이더', '아이언', '캡틴', '그린', '플래시', '아쿠아'), '{p}맨'),  # 배트맨 → 다른 슈퍼히어로들
+        '마우스': (('미니마우스', '제리마우스', '스튜어트마우스'), '{p}')  # 미키마우스 → 다른 마우스들
+    }
+    
+    # 패턴별 변형 목록 (입력이 고정이므로 클래스 정의 시 한 번만 생성)
+    _VARIATIONS = {
+        pattern: tuple(fmt.format(p=prefix) for prefix in prefixes)
+        for pattern, (prefixes, fmt) in _VARIATION_TABLE.items()
+    }
+    
     def __init__(self):
         self.character_groups = {
             'TiniPing': {
@@ -40,7 +56,25 @@ class SimpleCharacterExpansion:
             }
         }
         
+        # 그룹 멤버십 검사를 O(1)로
+        for group_data in self.character_groups.values():
+            group_data['base_characters'] = frozenset(group_data['base_characters'])
+        
+        # 캐릭터 이름 -> 그룹, 그룹 -> (패턴, 설명) 목록 역색인
+        self._name_to_group = {
+            name: group_name
+            for group_name, group_data in self.character_groups.items()
+            for name in group_data['base_characters']
+        }
+        self._group_patterns = {
+            group_name: list(group_data['patterns'].items())
+            for group_name, group_data in self.character_groups.items()
+        }
+        
         self.discovered_characters = {}
+        
+        # 색칠도안 생성기 (처음 필요할 때 한 번만 생성)
+        self._generator = None
     
     def expand_from_known_character(self, character_name: str) -> Dict[str, str]:
         """알려진 캐릭터로부터 연관 캐릭터들 확장"""
@@ -50,90 +84,78 @@ class SimpleCharacterExpansion:
         expanded_characters = {}
         
         # 캐릭터가 속한 그룹 찾기
-        for group_name, group_data in self.character_groups.items():
-            if character_name in group_data['base_characters']:
-                print(f"📚 {group_name} 그룹에서 확장 중...")
+        group_name = self._name_to_group.get(character_name)
+        if not group_name:
+            return expanded_characters
+        
+        print(f"📚 {group_name} 그룹에서 확장 중...")
+        
+        # 패턴 기반으로 새로운 캐릭터 생성
+        for pattern, description in self._group_patterns[group_name]:
+            if pattern in character_name:
+                # 다양한 변형 생성
+                variations = self.generate_character_variations(character_name, pattern)
                 
-                # 패턴 기반으로 새로운 캐릭터 생성
-                for pattern, description in group_data['patterns'].items():
-                    if pattern in character_name:
-                        # 다양한 변형 생성
-                        variations = self.generate_character_variations(character_name, pattern)
-                        
-                        for variation in variations:
-                            if variation != character_name:
-                                expanded_characters[variation] = {
-                                    'name': variation,
-                                    'description': description,
-                                    'group': group_name,
-                                    'discovered_from': character_name
-                                }
-                                print(f"  ✅ {variation} 생성")
+                for variation in variations:
+                    if variation != character_name:
+                        expanded_characters[variation] = {
+                            'name': variation,
+                            'description': description,
+                            'group': group_name,
+                            'discovered_from': character_name
+                        }
+                        print(f"  ✅ {variation} 생성")
         
         return expanded_characters
     
     def generate_character_variations(self, base_name: str, pattern: str) -> List[str]:
         """기본 캐릭터 이름으로부터 변형 생성"""
-        variations = []
-        
-        if pattern == '핑':
-            # 하츄핑 → 라라핑, 바로핑, 차차핑 등
-            prefixes = ['라라', '바로', '차차', '토토', '코코', '모모', '루루', '뽀뽀']
-            for prefix in prefixes:
-                variations.append(f"{prefix}핑")
-        
-        elif pattern == '미야옹':
-            # 아이언미야옹 → 다른 미야옹들
-            prefixes = ['골드', '실버', '브론즈', '다이아', '루비', '사파이어', '에메랄드']
-            for prefix in prefixes:
-                variations.append(f"{prefix}미야옹")
-        
-        elif pattern == '맨':
-            # 배트맨 → 다른 슈퍼히어로들
-            prefixes = ['슈퍼', '스파이더', '아이언', '캡틴', '그린', '플래시', '아쿠아']
-            for prefix in prefixes:
-                variations.append(f"{prefix}맨")
-        
-        elif pattern == '마우스':
-            # 미키마우스 → 다른 마우스들
-            variations = ['미니마우스', '제리마우스', '스튜어트마우스']
-        
-        return variations
+        return list(self._VARIATIONS.get(pattern, ()))
     
     def create_coloring_pages_for_expanded(self, expanded_characters: Dict[str, str]) -> None:
         """확장된 캐릭터들에 대한 색칠도안 생성"""
         print(f"\\n🎨 확장된 캐릭터들 색칠도안 생성")
         print("=" * 50)
         
-        from image_crawler_generator import ImageCrawlerGenerator
-        generator = ImageCrawlerGenerator()
+        if self._generator is None:
+            # 무거운 모듈은 실제 사용 시점에 로드
+            from image_crawler_generator import ImageCrawlerGenerator
+            self._generator = ImageCrawlerGenerator()
+        generator = self._generator
         
         # 기존 character_descriptions에 추가
         if not hasattr(generator, 'character_descriptions'):
             generator.character_descriptions = {}
         
+        # 캐릭터 설명 추가
         for char_name, char_data in expanded_characters.items():
-            try:
+            generator.character_descriptions[char_name] = char_data['description']
+        
+        # 네트워크 위주 작업이므로 캐릭터별로 스레드에서 병렬 생성
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = {}
+            for char_name in expanded_characters:
                 print(f"\\n🎯 {char_name} 색칠도안 생성 중...")
-                
-                # 캐릭터 설명 추가
-                generator.character_descriptions[char_name] = char_data['description']
-                
-                # 색칠도안 생성
-                result_file = generator.generate_coloring_pages(
+                futures[executor.submit(
+                    generator.generate_coloring_pages,
                     character_name=char_name,
                     age_group='child',
                     difficulty='easy',
                     count=2
-                )
-                
-                if result_file:
-                    print(f"✅ {char_name} 색칠도안 생성 완료")
-                else:
-                    print(f"❌ {char_name} 색칠도안 생성 실패")
+                )] = char_name
+            
+            for future in as_completed(futures):
+                char_name = futures[future]
+                try:
+                    result_file = future.result()
                     
-            except Exception as e:
-                print(f"❌ {char_name} 처리 실패: {e}")
+                    if result_file:
+                        print(f"✅ {char_name} 색칠도안 생성 완료")
+                    else:
+                        print(f"❌ {char_name} 색칠도안 생성 실패")
+                        
+                except Exception as e:
+                    print(f"❌ {char_name} 처리 실패: {e}")
     
     def save_expanded_database(self, expanded_characters: Dict[str, str], filename: str = "expanded_characters.json"):
         """확장된 캐릭터 데이터베이스 저장"""
@@ -166,8 +188,7 @@ def main():
     
     # 확장된 캐릭터들 출력
     print("\\n📋 확장된 캐릭터들:")
-    for char_name, char_data in all_expanded.items():
-        print(f"  - {char_name} ({char_data['group']})")
+    sys.stdout.write("".join(f"  - {char_name} ({char_data['group']})\n" for char_name, char_data in all_expanded.items()))
     
     # 데이터베이스 저장
     expansion.save_expanded_database(all_expanded)
@@ -3,16 +3,43 @@
 QA 테스트를 위한 샘플 데이터 생성 스크립트
 """
 
+import asyncio
 import json
 import requests
-import time
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 
 # API 기본 URL
 API_BASE_URL = "http://localhost:3001"
 
-def create_test_coloring_pages():
-    """테스트용 색칠공부 도안 생성"""
+# 모든 요청이 같은 호스트로 가므로 keep-alive 커넥션을 재사용하는 공유 세션
+SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json"})
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=16))
+
+# 비동기 요청 동시 실행 수 (API 부하 방지)
+MAX_CONCURRENT_REQUESTS = 4
+
+# 429/503 응답 시 재시도 설정
+RETRY_STATUSES = (429, 503)
+MAX_RETRY_ATTEMPTS = 5
+MAX_BACKOFF_SECONDS = 8
+
+async def post_with_backoff(session, url, payload):
+    """POST 요청 후 (status, json) 반환, 서버가 부하를 알릴 때만 대기 후 재시도"""
+    for attempt in range(MAX_RETRY_ATTEMPTS):
+        async with session.post(url, json=payload) as response:
+            if response.status not in RETRY_STATUSES or attempt == MAX_RETRY_ATTEMPTS - 1:
+                if response.status != 200:
+                    return response.status, None
+                return response.status, await response.json(content_type=None)
+            retry_after = response.headers.get("Retry-After", "")
+        
+        delay = float(retry_after) if retry_after.isdigit() else 0.5 * 2 ** attempt
+        await asyncio.sleep(min(delay, MAX_BACKOFF_SECONDS))
+
+async def create_test_coloring_pages(session, semaphore):
+    """테스트용 색칠공부 도안 생성 (요청 동시 실행)"""
     
     test_pages = [
         {
@@ -109,28 +136,52 @@ def create_test_coloring_pages():
     
     print("🎨 테스트용 색칠공부 도안 생성 중...")
     
-    for i, page_data in enumerate(test_pages):
-        try:
-            response = requests.post(
-                f"{API_BASE_URL}/api/coloring-pages/generate",
-                json=page_data,
-                headers={"Content-Type": "application/json"},
-                timeout=10
+    import aiohttp
+    
+    # 벌크 엔드포인트가 있으면 한 번의 요청으로 전체 도안 생성
+    try:
+        async with semaphore:
+            bulk_status, bulk_result = await post_with_backoff(
+                session, f"{API_BASE_URL}/api/coloring-pages/bulk", {"pages": test_pages}
             )
-            
-            if response.status_code == 200:
-                result = response.json()
-                if result.get("success"):
-                    print(f"✅ 도안 {i+1} 생성 완료: {page_data['characterName']}")
-                else:
-                    print(f"❌ 도안 {i+1} 생성 실패: {result.get('message', 'Unknown error')}")
-            else:
-                print(f"❌ 도안 {i+1} 생성 실패: HTTP {response.status_code}")
-                
-        except requests.exceptions.RequestException as e:
-            print(f"❌ 도안 {i+1} 생성 중 오류: {e}")
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        bulk_status, bulk_result = None, None
+        print(f"⚠️ 벌크 도안 생성 요청 오류, 개별 요청으로 대체: {e!r}")
+    
+    if bulk_status == 200 and isinstance(bulk_result, dict) and "results" in bulk_result:
+        results = [(200, page_result) for page_result in bulk_result["results"]]
+        report_page_results(test_pages, results)
+        return
+    if bulk_status is not None and bulk_status not in (404, 405):
+        print(f"⚠️ 벌크 도안 생성 실패 (HTTP {bulk_status}), 개별 요청으로 대체")
+    
+    # 벌크 라우트가 없거나 실패하면 개별 요청으로 대체
+    async def post_page(page_data):
+        async with semaphore:
+            return await post_with_backoff(session, f"{API_BASE_URL}/api/coloring-pages/generate", page_data)
+    
+    results = await asyncio.gather(
+        *(post_page(page_data) for page_data in test_pages),
+        return_exceptions=True
+    )
+    report_page_results(test_pages, results)
+
+def report_page_results(test_pages, results):
+    """도안별 생성 결과 출력"""
+    
+    for i, (page_data, outcome) in enumerate(zip(test_pages, results)):
+        if isinstance(outcome, Exception):
+            print(f"❌ 도안 {i+1} 생성 중 오류: {outcome!r}")
+            continue
         
-        time.sleep(1)  # API 부하 방지
+        status, result = outcome
+        if status == 200:
+            if result.get("success"):
+                print(f"✅ 도안 {i+1} 생성 완료: {page_data['characterName']}")
+            else:
+                print(f"❌ 도안 {i+1} 생성 실패: {result.get('message', 'Unknown error')}")
+        else:
+            print(f"❌ 도안 {i+1} 생성 실패: HTTP {status}")
 
 def create_test_characters():
     """테스트용 캐릭터 데이터 생성"""
@@ -206,8 +257,8 @@ def create_test_themes():
     for theme in themes:
         print(f"✅ 테마 데이터 준비: {theme['name']}")
 
-def test_api_endpoints():
-    """API 엔드포인트 테스트"""
+async def test_api_endpoints(session, semaphore):
+    """API 엔드포인트 테스트 (요청 동시 실행)"""
     
     print("🔍 API 엔드포인트 테스트 중...")
     
@@ -219,20 +270,38 @@ def test_api_endpoints():
         ("POST", "/api/newsletter/subscribe", "뉴스레터 구독"),
     ]
     
-    for method, endpoint, description in endpoints:
-        try:
-            if method == "GET":
-                response = requests.get(f"{API_BASE_URL}{endpoint}", timeout=5)
-            else:
-                response = requests.post(f"{API_BASE_URL}{endpoint}", json={}, timeout=5)
-            
-            if response.status_code in [200, 201, 400, 404]:  # 400, 404도 정상 응답으로 간주
-                print(f"✅ {description}: {response.status_code}")
-            else:
-                print(f"❌ {description}: {response.status_code}")
-                
-        except requests.exceptions.RequestException as e:
-            print(f"❌ {description}: 연결 실패 - {e}")
+    import aiohttp
+    probe_timeout = aiohttp.ClientTimeout(total=5)
+    
+    async def probe(method, endpoint):
+        async with semaphore:
+            kwargs = {} if method == "GET" else {"json": {}}
+            async with session.request(method, f"{API_BASE_URL}{endpoint}", timeout=probe_timeout, **kwargs) as response:
+                return response.status
+    
+    statuses = await asyncio.gather(
+        *(probe(method, endpoint) for method, endpoint, _ in endpoints),
+        return_exceptions=True
+    )
+    
+    for (method, endpoint, description), status in zip(endpoints, statuses):
+        if isinstance(status, Exception):
+            print(f"❌ {description}: 연결 실패 - {status!r}")
+        elif status in [200, 201, 400, 404]:  # 400, 404도 정상 응답으로 간주
+            print(f"✅ {description}: {status}")
+        else:
+            print(f"❌ {description}: {status}")
+
+async def run_all():
+    """도안 생성과 엔드포인트 테스트를 하나의 aiohttp 세션으로 동시 실행"""
+    import aiohttp
+    
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
+        await asyncio.gather(
+            create_test_coloring_pages(session, semaphore),
+            test_api_endpoints(session, semaphore)
+        )
 
 def main():
     """메인 실행 함수"""
@@ -242,7 +311,7 @@ def main():
     
     # API 서버 연결 확인
     try:
-        response = requests.get(f"{API_BASE_URL}/health", timeout=5)
+        response = SESSION.get(f"{API_BASE_URL}/health", timeout=5)
         if response.status_code == 200:
             print("✅ 백엔드 서버 연결 확인")
         else:
@@ -255,12 +324,11 @@ def main():
         return
     
     # 테스트 데이터 생성
-    create_test_coloring_pages()
     create_test_characters()
     create_test_themes()
     
-    # API 엔드포인트 테스트
-    test_api_endpoints()
+    # 색칠공부 도안 생성 및 API 엔드포인트 테스트 (동시 실행)
+    asyncio.run(run_all())
     
     print("=" * 50)
     print("✅ QA 테스트 데이터 생성 완료")
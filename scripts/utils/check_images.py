@@ -5,55 +5,98 @@
 """
 
 import os
-import cv2
-import numpy as np
-from PIL import Image
-import json
+import orjson
+from concurrent.futures import ProcessPoolExecutor
+
+# 검사 대상 이미지 확장자 (str.endswith에 바로 넘길 수 있도록 튜플)
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.webp')
+
+# 파일 시그니처 → 이미지 포맷 (PIL 포맷 이름과 동일)
+_FORMAT_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'PNG'),
+    (b'\xff\xd8\xff', 'JPEG'),
+    (b'GIF8', 'GIF'),
+    (b'BM', 'BMP'),
+    (b'II*\x00', 'TIFF'),
+    (b'MM\x00*', 'TIFF'),
+)
+
+def _sniff_format(header: bytes):
+    """파일 앞부분 바이트로 이미지 포맷 판별"""
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'WEBP'
+    return next((name for signature, name in _FORMAT_SIGNATURES if header.startswith(signature)), None)
 
 def check_image_properties(image_path: str) -> dict:
     """이미지 속성 확인"""
+    import cv2
+    import numpy as np
+    
     try:
-        # PIL로 이미지 정보 확인
-        with Image.open(image_path) as img:
-            pil_info = {
-                'format': img.format,
-                'mode': img.mode,
-                'size': img.size,
-                'width': img.width,
-                'height': img.height,
-                'has_transparency': img.mode in ('RGBA', 'LA') or 'transparency' in img.info
-            }
+        # 헤더로 포맷 확인 (stat 한 번으로 크기 확인)
+        with open(image_path, 'rb') as f:
+            header = f.read(12)
+            size_bytes = os.fstat(f.fileno()).st_size
         
-        # OpenCV로 이미지 분석
-        cv_img = cv2.imread(image_path)
-        if cv_img is not None:
-            cv_info = {
-                'channels': cv_img.shape[2] if len(cv_img.shape) == 3 else 1,
-                'dtype': str(cv_img.dtype),
-                'mean_brightness': float(np.mean(cv_img)),
-                'std_brightness': float(np.std(cv_img)),
-                'min_value': int(np.min(cv_img)),
-                'max_value': int(np.max(cv_img))
-            }
-            
-            # 윤곽선 검출
-            gray = cv2.cvtColor(cv_img, cv2.COLOR_BGR2GRAY)
-            edges = cv2.Canny(gray, 50, 150)
-            contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            cv_info.update({
-                'edge_count': len(contours),
-                'total_edge_pixels': int(np.sum(edges > 0)),
-                'edge_density': float(np.sum(edges > 0) / (img.width * img.height))
-            })
+        # 알파 채널을 유지한 채 한 번만 디코딩
+        cv_img = cv2.imread(image_path, cv2.IMREAD_UNCHANGED)
+        if cv_img is None:
+            raise ValueError(f"이미지를 읽을 수 없습니다: {image_path}")
+        if cv_img.dtype == np.uint16:
+            cv_img = (cv_img >> 8).astype(np.uint8)
+        
+        height, width = cv_img.shape[:2]
+        channels = cv_img.shape[2] if cv_img.ndim == 3 else 1
+        mode = {1: 'L', 2: 'LA', 4: 'RGBA'}.get(channels, 'RGB')
+        pil_info = {
+            'format': _sniff_format(header),
+            'mode': mode,
+            'size': (width, height),
+            'width': width,
+            'height': height,
+            'has_transparency': channels in (2, 4)
+        }
+        
+        # 밝기 통계와 윤곽선은 알파를 제외한 색상 채널로 분석
+        if channels <= 2:
+            # 그레이스케일 (2채널은 그레이 + 알파)
+            color = cv_img[:, :, 0] if channels == 2 else cv_img
+            gray = color
         else:
-            cv_info = {'error': 'OpenCV로 이미지를 읽을 수 없음'}
+            color = cv_img[:, :, :3] if channels == 4 else cv_img
+            gray = cv2.cvtColor(color, cv2.COLOR_BGR2GRAY)
+        
+        # 채널별 평균/표준편차를 한 번에 구한 뒤 전체 값으로 합산
+        mean_vec, std_vec = cv2.meanStdDev(color)
+        mean_brightness = float(mean_vec.mean())
+        std_brightness = float(np.sqrt(max((std_vec ** 2 + mean_vec ** 2).mean() - mean_brightness ** 2, 0.0)))
+        min_value, max_value, _, _ = cv2.minMaxLoc(color.reshape(height, -1))
+        
+        cv_info = {
+            'channels': channels,
+            'dtype': str(cv_img.dtype),
+            'mean_brightness': mean_brightness,
+            'std_brightness': std_brightness,
+            'min_value': int(min_value),
+            'max_value': int(max_value)
+        }
+        
+        # 윤곽선 검출
+        edges = cv2.Canny(gray, 50, 150)
+        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        
+        edge_pixels = cv2.countNonZero(edges)
+        cv_info.update({
+            'edge_count': len(contours),
+            'total_edge_pixels': int(edge_pixels),
+            'edge_density': float(edge_pixels / edges.size)
+        })
         
         # 파일 정보
         file_info = {
-            'file_size_bytes': os.path.getsize(image_path),
-            'file_size_mb': round(os.path.getsize(image_path) / (1024 * 1024), 2),
-            'exists': os.path.exists(image_path)
+            'file_size_bytes': size_bytes,
+            'file_size_mb': round(size_bytes / (1024 * 1024), 2),
+            'exists': True
         }
         
         return {
@@ -74,13 +117,12 @@ def check_images_in_directory(directory: str) -> dict:
     if not os.path.exists(directory):
         return {'error': f'디렉토리가 존재하지 않습니다: {directory}'}
     
-    image_extensions = {'.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.webp'}
-    image_files = []
-    
     # 이미지 파일 찾기
-    for filename in os.listdir(directory):
-        if any(filename.lower().endswith(ext) for ext in image_extensions):
-            image_files.append(os.path.join(directory, filename))
+    with os.scandir(directory) as entries:
+        image_files = [
+            entry.path for entry in entries
+            if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS)
+        ]
     
     if not image_files:
         return {'error': f'이미지 파일을 찾을 수 없습니다: {directory}'}
@@ -89,7 +131,10 @@ def check_images_in_directory(directory: str) -> dict:
     print(f"📊 발견된 이미지: {len(image_files)}개")
     print("-" * 60)
     
-    results = []
+    # 이미지별 분석은 서로 독립적이므로 여러 프로세스에서 병렬 처리
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = list(executor.map(check_image_properties, image_files, chunksize=4))
+    
     total_stats = {
         'total_files': len(image_files),
         'total_size_mb': 0,
@@ -98,12 +143,9 @@ def check_images_in_directory(directory: str) -> dict:
         'edge_densities': []
     }
     
-    for i, image_path in enumerate(image_files, 1):
+    for i, (image_path, result) in enumerate(zip(image_files, results), 1):
         print(f"\n{i:2d}. {os.path.basename(image_path)}")
         
-        result = check_image_properties(image_path)
-        results.append(result)
-        
         if 'error' not in result:
             pil_info = result['pil_info']
             cv_info = result['cv_info']
@@ -114,17 +156,14 @@ def check_images_in_directory(directory: str) -> dict:
             print(f"    🎨 포맷: {pil_info['format']} ({pil_info['mode']})")
             print(f"    💾 파일크기: {file_info['file_size_mb']}MB")
             
-            if 'error' not in cv_info:
-                print(f"    🌟 밝기: {cv_info['mean_brightness']:.1f} ± {cv_info['std_brightness']:.1f}")
-                print(f"    📐 윤곽선: {cv_info['edge_count']}개, 밀도: {cv_info['edge_density']:.3f}")
-                
-                # 통계 수집
-                total_stats['total_size_mb'] += file_info['file_size_mb']
-                total_stats['formats'][pil_info['format']] = total_stats['formats'].get(pil_info['format'], 0) + 1
-                total_stats['sizes'].append((pil_info['width'], pil_info['height']))
-                total_stats['edge_densities'].append(cv_info['edge_density'])
-            else:
-                print(f"    ❌ OpenCV 분석 실패: {cv_info['error']}")
+            print(f"    🌟 밝기: {cv_info['mean_brightness']:.1f} ± {cv_info['std_brightness']:.1f}")
+            print(f"    📐 윤곽선: {cv_info['edge_count']}개, 밀도: {cv_info['edge_density']:.3f}")
+            
+            # 통계 수집
+            total_stats['total_size_mb'] += file_info['file_size_mb']
+            total_stats['formats'][pil_info['format']] = total_stats['formats'].get(pil_info['format'], 0) + 1
+            total_stats['sizes'].append((pil_info['width'], pil_info['height']))
+            total_stats['edge_densities'].append(cv_info['edge_density'])
         else:
             print(f"    ❌ 분석 실패: {result['error']}")
     
@@ -165,8 +204,8 @@ def save_check_results(results: dict, output_file: str = None):
         output_file = f"image_check_results_{timestamp}.json"
     
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         print(f"\n💾 검사 결과 저장: {output_file}")
     except Exception as e:
         print(f"❌ 결과 저장 실패: {e}")
@@ -5,11 +5,41 @@
 """
 
 import os
-from PIL import Image, ImageDraw, ImageFont
-import numpy as np
+
+# 공통 도형 (머리, 몸, 팔, 다리)
+_HEAD = ('ellipse', [150, 100, 250, 200])
+_BODY = ('ellipse', [170, 200, 230, 300])
+_ARMS = (('line', [(150, 150), (100, 200)]), ('line', [(250, 150), (300, 200)]))
+_LEGS = (('line', [(180, 300), (180, 350)]), ('line', [(220, 300), (220, 350)]))
+_ROUND_EARS = (('ellipse', [120, 80, 140, 100]), ('ellipse', [260, 80, 280, 100]))
+
+# 이름 키워드 → 그리기 명령 (위에서부터 먼저 일치하는 항목 사용)
+CHAR_SHAPES = (
+    (('피카츄', '포켓몬'), (_HEAD, *_ROUND_EARS, _BODY, *_ARMS, *_LEGS)),
+    (('미키',), (_HEAD, *_ROUND_EARS, _BODY, *_ARMS, *_LEGS)),
+    (('키티', '헬로'), (
+        _HEAD,
+        ('polygon', [(150, 100), (140, 80), (160, 80)]),  # 귀 (삼각형 모양)
+        ('polygon', [(250, 100), (240, 80), (260, 80)]),
+        _BODY, *_ARMS,
+    )),
+)
+DEFAULT_SHAPES = (_HEAD, _BODY, *_ARMS, *_LEGS)
+
+# 선 색상을 지정하는 인자 이름 (line은 fill, 나머지는 outline)
+_STROKE_KWARG = {'ellipse': 'outline', 'polygon': 'outline', 'line': 'fill'}
+
+def _select_shapes(character_name: str):
+    """캐릭터 이름에 맞는 그리기 명령 반환"""
+    return next(
+        (ops for keywords, ops in CHAR_SHAPES if any(k in character_name for k in keywords)),
+        DEFAULT_SHAPES
+    )
 
 def create_test_image(character_name: str, output_dir: str = "test_images"):
     """테스트용 이미지 생성"""
+    from PIL import Image, ImageDraw
+    
     try:
         # 출력 디렉토리 생성
         os.makedirs(output_dir, exist_ok=True)
@@ -22,46 +52,8 @@ def create_test_image(character_name: str, output_dir: str = "test_images"):
         draw = ImageDraw.Draw(img)
         
         # 캐릭터별 기본 도형 그리기
-        if '피카츄' in character_name or '포켓몬' in character_name:
-            # 피카츄 스타일
-            draw.ellipse([150, 100, 250, 200], outline='black', width=3)  # 머리
-            draw.ellipse([120, 80, 140, 100], outline='black', width=3)   # 왼쪽 귀
-            draw.ellipse([260, 80, 280, 100], outline='black', width=3)  # 오른쪽 귀
-            draw.ellipse([170, 200, 230, 300], outline='black', width=3)  # 몸
-            draw.line([(150, 150), (100, 200)], fill='black', width=3)    # 왼쪽 팔
-            draw.line([(250, 150), (300, 200)], fill='black', width=3)     # 오른쪽 팔
-            draw.line([(180, 300), (180, 350)], fill='black', width=3)    # 왼쪽 다리
-            draw.line([(220, 300), (220, 350)], fill='black', width=3)    # 오른쪽 다리
-            
-        elif '미키' in character_name:
-            # 미키마우스 스타일
-            draw.ellipse([150, 100, 250, 200], outline='black', width=3)  # 머리
-            draw.ellipse([120, 80, 140, 100], outline='black', width=3)     # 왼쪽 귀
-            draw.ellipse([260, 80, 280, 100], outline='black', width=3)   # 오른쪽 귀
-            draw.ellipse([170, 200, 230, 300], outline='black', width=3)   # 몸
-            draw.line([(150, 150), (100, 200)], fill='black', width=3)    # 왼쪽 팔
-            draw.line([(250, 150), (300, 200)], fill='black', width=3)     # 오른쪽 팔
-            draw.line([(180, 300), (180, 350)], fill='black', width=3)    # 왼쪽 다리
-            draw.line([(220, 300), (220, 350)], fill='black', width=3)    # 오른쪽 다리
-            
-        elif '키티' in character_name or '헬로' in character_name:
-            # 헬로키티 스타일
-            draw.ellipse([150, 100, 250, 200], outline='black', width=3)  # 머리
-            # 귀 (삼각형 모양)
-            draw.polygon([(150, 100), (140, 80), (160, 80)], outline='black', width=3)
-            draw.polygon([(250, 100), (240, 80), (260, 80)], outline='black', width=3)
-            draw.ellipse([170, 200, 230, 300], outline='black', width=3)   # 몸
-            draw.line([(150, 150), (100, 200)], fill='black', width=3)    # 왼쪽 팔
-            draw.line([(250, 150), (300, 200)], fill='black', width=3)     # 오른쪽 팔
-            
-        else:
-            # 기본 캐릭터
-            draw.ellipse([150, 100, 250, 200], outline='black', width=3)  # 머리
-            draw.ellipse([170, 200, 230, 300], outline='black', width=3)   # 몸
-            draw.line([(150, 150), (100, 200)], fill='black', width=3)    # 왼쪽 팔
-            draw.line([(250, 150), (300, 200)], fill='black', width=3)     # 오른쪽 팔
-            draw.line([(180, 300), (180, 350)], fill='black', width=3)    # 왼쪽 다리
-            draw.line([(220, 300), (220, 350)], fill='black', width=3)    # 오른쪽 다리
+        for op, coords in _select_shapes(character_name):
+            getattr(draw, op)(coords, **{_STROKE_KWARG[op]: 'black'}, width=3)
         
         # 파일명 생성
         filename = f"{character_name}_test.png"
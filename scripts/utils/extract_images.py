@@ -4,54 +4,74 @@
 JSON 파일에서 Base64 이미지를 추출하여 PNG 파일로 저장
 """
 
-import json
 import base64
+import ijson
 import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 
-def extract_images_from_json(json_file: str, output_dir: str = "extracted_images"):
-    """JSON 파일에서 이미지 추출"""
+# 디코딩/저장 동시 작업 수
+EXTRACT_WORKERS = min(8, os.cpu_count() or 1)
+
+def _decode_and_write(page: dict, output_dir: str, character_name: str) -> bool:
+    """페이지 하나의 Base64 이미지를 디코딩해 PNG 파일로 저장"""
+    page_number = page.get('page_number', 0)
+    image_base64 = page.get('generated_image_base64', '')
+    
+    if not image_base64:
+        return False
+    
     try:
-        # 출력 디렉토리 생성
-        os.makedirs(output_dir, exist_ok=True)
+        # Base64 디코딩
+        image_data = base64.b64decode(image_base64)
         
-        # JSON 파일 읽기
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # 파일명 생성
+        filename = f"{character_name}_page_{page_number:02d}.png"
+        filepath = os.path.join(output_dir, filename)
         
-        character_name = data.get('character_name', 'unknown')
-        generated_pages = data.get('generated_pages', [])
+        # 이미지 파일 저장
+        with open(filepath, 'wb', buffering=1024 * 1024) as out:
+            out.write(image_data)
         
-        print(f"📁 {character_name} 이미지 추출 시작")
-        print(f"📊 총 {len(generated_pages)}개 페이지")
+        print(f"✅ 추출 완료: {filename}")
+        return True
         
-        extracted_count = 0
+    except Exception as e:
+        print(f"❌ 페이지 {page_number} 추출 실패: {e}")
+        return False
+
+def extract_images_from_json(json_file: str, output_dir: str = "extracted_images"):
+    """JSON 파일에서 이미지 추출"""
+    try:
+        # 출력 디렉토리 생성
+        os.makedirs(output_dir, exist_ok=True)
         
-        for page in generated_pages:
-            page_number = page.get('page_number', 0)
-            image_base64 = page.get('generated_image_base64', '')
+        # JSON 파일을 스트리밍으로 읽어 메모리에는 한 페이지씩만 유지
+        with open(json_file, 'rb') as f:
+            # 캐릭터 이름은 generated_pages보다 앞에 있으므로 먼저 읽은 뒤 처음부터 다시 읽음
+            character_name = next(ijson.items(f, 'character_name'), 'unknown')
+            f.seek(0)
             
-            if image_base64:
-                try:
-                    # Base64 디코딩
-                    image_data = base64.b64decode(image_base64)
-                    
-                    # 파일명 생성
-                    filename = f"{character_name}_page_{page_number:02d}.png"
-                    filepath = os.path.join(output_dir, filename)
-                    
-                    # 이미지 파일 저장
-                    with open(filepath, 'wb') as f:
-                        f.write(image_data)
-                    
-                    print(f"✅ 추출 완료: {filename}")
-                    extracted_count += 1
+            print(f"📁 {character_name} 이미지 추출 시작")
+            
+            page_count = 0
+            extracted_count = 0
+            
+            # 다음 페이지 파싱과 디코딩/저장을 겹치되, 메모리에 쌓이는 페이지 수는 제한
+            with ThreadPoolExecutor(max_workers=EXTRACT_WORKERS) as executor:
+                pending = set()
+                for page in ijson.items(f, 'generated_pages.item'):
+                    page_count += 1
+                    pending.add(executor.submit(_decode_and_write, page, output_dir, character_name))
                     
-                except Exception as e:
-                    print(f"❌ 페이지 {page_number} 추출 실패: {e}")
+                    if len(pending) >= EXTRACT_WORKERS * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        extracted_count += sum(future.result() for future in done)
+                
+                extracted_count += sum(future.result() for future in pending)
         
         print(f"\n🎉 이미지 추출 완료!")
-        print(f"📊 추출된 이미지: {extracted_count}개")
+        print(f"📊 추출된 이미지: {extracted_count}/{page_count}개")
         print(f"📁 저장 위치: {output_dir}/")
         
         return extracted_count
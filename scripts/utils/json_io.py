@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+JSON 파일 입출력 도우미
+생성 스크립트들이 공유하는 결과 파일 저장 함수
+"""
+
+import os
+import orjson
+
+def atomic_write_json(path, obj):
+    """JSON을 임시 파일에 한 번에 쓴 뒤 os.replace로 원자적으로 교체"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    os.replace(tmp_path, path)
@@ -4,22 +4,23 @@
 이미지에서 윤곽선을 추출하여 색칠놀이 도안으로 변환
 """
 
-import cv2
-import numpy as np
-from PIL import Image, ImageFilter
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# 이미지 확장자 (str.endswith에 바로 넘길 수 있도록 튜플)
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.webp')
 
 def extract_outline(image_path: str, output_path: str = None, method: str = 'canny') -> str:
     """이미지에서 윤곽선 추출"""
+    import cv2
+    import numpy as np
+    
     try:
-        # 이미지 읽기
-        img = cv2.imread(image_path)
-        if img is None:
+        # 이미지를 그레이스케일로 바로 디코딩
+        gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        if gray is None:
             raise ValueError(f"이미지를 읽을 수 없습니다: {image_path}")
         
-        # 그레이스케일 변환
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        
         # 노이즈 제거
         blurred = cv2.GaussianBlur(gray, (5, 5), 0)
         
@@ -28,16 +29,15 @@ def extract_outline(image_path: str, output_path: str = None, method: str = 'can
             edges = cv2.Canny(blurred, 50, 150)
             
         elif method == 'sobel':
-            # Sobel 엣지 검출
-            sobel_x = cv2.Sobel(blurred, cv2.CV_64F, 1, 0, ksize=3)
-            sobel_y = cv2.Sobel(blurred, cv2.CV_64F, 0, 1, ksize=3)
-            edges = np.sqrt(sobel_x**2 + sobel_y**2)
-            edges = np.uint8(edges / edges.max() * 255)
+            # Sobel 엣지 검출 (float32 기울기 크기를 최댓값 255로 정규화해 바로 uint8 변환)
+            sobel_x = cv2.Sobel(blurred, cv2.CV_32F, 1, 0, ksize=3)
+            sobel_y = cv2.Sobel(blurred, cv2.CV_32F, 0, 1, ksize=3)
+            magnitude = cv2.magnitude(sobel_x, sobel_y)
+            edges = cv2.normalize(magnitude, None, 255, 0, cv2.NORM_INF, cv2.CV_8U)
             
         elif method == 'laplacian':
-            # Laplacian 엣지 검출
-            laplacian = cv2.Laplacian(blurred, cv2.CV_64F)
-            edges = np.uint8(np.absolute(laplacian))
+            # Laplacian 엣지 검출 (16비트 결과의 절댓값을 포화 변환)
+            edges = cv2.convertScaleAbs(cv2.Laplacian(blurred, cv2.CV_16S))
             
         else:
             raise ValueError(f"지원하지 않는 방법입니다: {method}")
@@ -47,7 +47,7 @@ def extract_outline(image_path: str, output_path: str = None, method: str = 'can
         edges = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel)
         
         # 흰색 배경에 검은색 윤곽선으로 변환
-        outline_img = 255 - edges
+        outline_img = cv2.bitwise_not(edges)
         
         # 출력 파일명 생성
         if output_path is None:
@@ -66,6 +66,8 @@ def extract_outline(image_path: str, output_path: str = None, method: str = 'can
 
 def extract_outline_pil(image_path: str, output_path: str = None) -> str:
     """PIL을 사용한 윤곽선 추출"""
+    from PIL import Image, ImageFilter, ImageOps
+    
     try:
         # 이미지 열기
         img = Image.open(image_path)
@@ -81,7 +83,7 @@ def extract_outline_pil(image_path: str, output_path: str = None) -> str:
         edges = edges.filter(ImageFilter.EDGE_ENHANCE_MORE)
         
         # 흰색 배경에 검은색 윤곽선으로 변환
-        outline_img = Image.eval(edges, lambda x: 255 - x)
+        outline_img = ImageOps.invert(edges)
         
         # 출력 파일명 생성
         if output_path is None:
@@ -109,14 +111,12 @@ def batch_extract_outlines(input_dir: str, output_dir: str = None, method: str =
     
     os.makedirs(output_dir, exist_ok=True)
     
-    # 이미지 파일 확장자
-    image_extensions = {'.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.webp'}
-    
     # 이미지 파일 찾기
-    image_files = []
-    for filename in os.listdir(input_dir):
-        if any(filename.lower().endswith(ext) for ext in image_extensions):
-            image_files.append(os.path.join(input_dir, filename))
+    with os.scandir(input_dir) as entries:
+        image_files = [
+            entry.path for entry in entries
+            if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS)
+        ]
     
     if not image_files:
         print(f"❌ 이미지 파일을 찾을 수 없습니다: {input_dir}")
@@ -130,16 +130,21 @@ def batch_extract_outlines(input_dir: str, output_dir: str = None, method: str =
     
     success_count = 0
     
-    for i, image_path in enumerate(image_files, 1):
-        filename = os.path.basename(image_path)
-        base_name = os.path.splitext(filename)[0]
-        output_path = os.path.join(output_dir, f"{base_name}_outline.png")
-        
-        print(f"{i:2d}. {filename}")
-        
-        result = extract_outline(image_path, output_path, method)
-        if result:
-            success_count += 1
+    def output_for(image_path):
+        base_name = os.path.splitext(os.path.basename(image_path))[0]
+        return os.path.join(output_dir, f"{base_name}_outline.png")
+    
+    # OpenCV 연산은 GIL을 해제하므로 스레드로 여러 이미지를 동시에 처리
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = {
+            executor.submit(extract_outline, image_path, output_for(image_path), method): image_path
+            for image_path in image_files
+        }
+        
+        for i, future in enumerate(as_completed(futures), 1):
+            print(f"{i:2d}. {os.path.basename(futures[future])}")
+            if future.result():
+                success_count += 1
     
     print(f"\n🎉 윤곽선 추출 완료!")
     print(f"📊 성공: {success_count}/{len(image_files)}개")